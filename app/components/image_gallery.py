@@ -1,38 +1,132 @@
 """Image gallery component."""
 
+import base64
+import io
+import math
 import streamlit as st
 from pathlib import Path
 from typing import List
 
 
-def render_image_gallery(images: List, columns: int = 3, show_metadata: bool = True):
-    """Render a gallery of extracted images."""
+_ROW_TMPL = (
+    '<div style="display: grid; grid-template-columns: repeat({columns}, 1fr); '
+    'gap: 1rem; margin-bottom: 1rem;">{cells}</div>'
+)
+
+_CELL_TMPL = (
+    '<figure style="margin: 0;"><img src="{src}" loading="lazy" decoding="async" '
+    'style="width: 100%; border-radius: 4px;">'
+    '<figcaption style="text-align: center; color: #6b7280; font-size: 0.875rem;">Page {page}</figcaption>'
+    '{meta}</figure>'
+)
+
+_META_TMPL = '<div style="color: #9ca3af; font-size: 0.8rem;">{width}x{height} - {format}</div>'
+
+_MISSING_CELL = (
+    '<div style="background-color: #fef3c7; color: #92400e; padding: 0.75rem 1rem; '
+    'border-radius: 6px;">Image not found</div>'
+)
+
+
+@st.cache_data(max_entries=1024, show_spinner=False)
+def _thumb(path: str, width: int = 256) -> bytes:
+    """Encode a downscaled WEBP thumbnail of an image file."""
+    from PIL import Image
+    
+    with Image.open(path) as image:
+        image.thumbnail((width, width))
+        buf = io.BytesIO()
+        image.save(buf, "WEBP", quality=75)
+    return buf.getvalue()
+
+
+@st.cache_data(max_entries=1024, show_spinner=False)
+def _thumb_data_uri(path: str) -> str:
+    """Get a thumbnail as a base64 data URI for inline <img> tags."""
+    return "data:image/webp;base64," + base64.b64encode(_thumb(path)).decode("ascii")
+
+
+@st.cache_data(ttl="30s", max_entries=4096, show_spinner=False)
+def _exists(path: str) -> bool:
+    """Check whether a file exists, cached briefly."""
+    return Path(path).exists()
+
+
+@st.cache_data(ttl="30s", max_entries=256, show_spinner=False)
+def _existing_set(paths: tuple) -> frozenset:
+    """Get the subset of paths that exist, cached briefly."""
+    return frozenset(p for p in paths if Path(p).exists())
+
+
+@st.cache_data(max_entries=64, ttl="15m", show_spinner=False)
+def _image_bytes(path: str) -> bytes:
+    """Read an image file for download."""
+    return Path(path).read_bytes()
+
+
+def _shift_gallery_page(key: str, delta: int):
+    """Move a gallery by delta pages (used as a button callback)."""
+    st.session_state[key] = st.session_state.get(key, 0) + delta
+
+
+def render_image_gallery(images: List, columns: int = 3, show_metadata: bool = True,
+                         per_page: int = 24, key: str = "gallery_page"):
+    """Render a paginated gallery of extracted images; give each gallery on a page its own key."""
     if not images:
         st.info("No images found in this paper.")
         return
     
     st.markdown(f"**{len(images)} images extracted**")
+    _render_gallery_page(images, columns, show_metadata, per_page, key)
+
+
+@st.fragment
+def _render_gallery_page(images: List, columns: int, show_metadata: bool, per_page: int, key: str):
+    """Render the current gallery page; pagination reruns only this fragment."""
+    # Start from the first page when the gallery shows a different set of images
+    images_hash = hash(tuple(img.file_path for img in images))
+    if st.session_state.get(f"{key}_images") != images_hash:
+        st.session_state[f"{key}_images"] = images_hash
+        st.session_state[key] = 0
+    
+    page_count = math.ceil(len(images) / per_page)
+    page = min(max(st.session_state.get(key, 0), 0), page_count - 1)
+    st.session_state[key] = page
+    page_images = images[page * per_page:(page + 1) * per_page]
+    
+    existing = _existing_set(tuple(img.file_path for img in page_images))
+    
+    for i in range(0, len(page_images), columns):
+        cells = []
+        for img in page_images[i:i + columns]:
+            if img.file_path not in existing:
+                cells.append(_MISSING_CELL)
+                continue
+            meta = _META_TMPL.format(width=img.width, height=img.height, format=img.format) if show_metadata else ""
+            cells.append(_CELL_TMPL.format(
+                src=_thumb_data_uri(img.file_path),
+                page=img.page_number,
+                meta=meta,
+            ))
+        st.markdown(_ROW_TMPL.format(columns=columns, cells="".join(cells)), unsafe_allow_html=True)
     
-    for i in range(0, len(images), columns):
-        cols = st.columns(columns)
-        for j, col in enumerate(cols):
-            if i + j < len(images):
-                img = images[i + j]
-                with col:
-                    img_path = Path(img.file_path)
-                    if img_path.exists():
-                        st.image(str(img_path), caption=f"Page {img.page_number}", use_container_width=True)
-                        if show_metadata:
-                            st.caption(f"{img.width}x{img.height} - {img.format}")
-                    else:
-                        st.warning("Image not found")
+    if page_count > 1:
+        prev_col, info_col, next_col = st.columns([1, 2, 1])
+        with prev_col:
+            st.button("Previous", key=f"{key}_prev", disabled=page == 0,
+                      on_click=_shift_gallery_page, args=(key, -1), use_container_width=True)
+        with info_col:
+            st.caption(f"Page {page + 1} of {page_count}")
+        with next_col:
+            st.button("Next", key=f"{key}_next", disabled=page >= page_count - 1,
+                      on_click=_shift_gallery_page, args=(key, 1), use_container_width=True)
 
 
 def render_image_detail(image):
     """Render detailed view of a single image."""
     img_path = Path(image.file_path)
     
-    if img_path.exists():
+    if _exists(image.file_path):
         st.image(str(img_path), use_container_width=True)
         
         col1, col2, col3 = st.columns(3)
@@ -43,12 +137,11 @@ def render_image_detail(image):
         with col3:
             st.metric("Format", image.format)
         
-        with open(img_path, "rb") as f:
-            st.download_button(
-                label="Download Image",
-                data=f.read(),
-                file_name=img_path.name,
-                mime=f"image/{image.format.lower()}"
-            )
+        st.download_button(
+            label="Download Image",
+            data=_image_bytes(str(img_path)),
+            file_name=img_path.name,
+            mime=f"image/{image.format.lower()}"
+        )
     else:
         st.error("Image file not found")
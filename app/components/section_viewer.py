@@ -1,26 +1,37 @@
 """Section viewer component."""
 
 import streamlit as st
+from functools import lru_cache
 
 
-def render_section_card(section_type: str, content: str, confidence: float, word_count: int, expanded: bool = False):
-    """Render a section card with expandable content."""
-    if confidence >= 0.8:
-        badge_color = "#10b981"
-    elif confidence >= 0.6:
-        badge_color = "#f59e0b"
-    else:
-        badge_color = "#ef4444"
-    
-    st.markdown(f"""
+_CARD_TMPL = """
     <div style="background-color: #f9fafb; border: 1px solid #e5e7eb; border-radius: 8px; padding: 1rem; margin-bottom: 1rem;">
         <div style="display: flex; justify-content: space-between; align-items: center;">
-            <span style="font-size: 1.1rem; font-weight: 600;">{section_type.capitalize()}</span>
+            <span style="font-size: 1.1rem; font-weight: 600;">{title}</span>
             <span style="background-color: {badge_color}; color: white; padding: 0.2rem 0.6rem; 
                          border-radius: 9999px; font-size: 0.8rem;">{confidence:.0%}</span>
         </div>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+# (minimum confidence, badge color), checked in order
+_BADGE = [(0.8, "#10b981"), (0.6, "#f59e0b"), (0.0, "#ef4444")]
+
+
+@lru_cache(maxsize=512)
+def _build_card_html(section_type: str, confidence: float) -> str:
+    """Build the card header HTML for a section type and confidence."""
+    badge_color = next((c for t, c in _BADGE if confidence >= t), _BADGE[-1][1])
+    return _CARD_TMPL.format(
+        title=section_type.capitalize(),
+        badge_color=badge_color,
+        confidence=confidence,
+    )
+
+
+def render_section_card(section_type: str, content: str, confidence: float, word_count: int, expanded: bool = False):
+    """Render a section card with expandable content."""
+    st.markdown(_build_card_html(section_type, confidence), unsafe_allow_html=True)
     
     with st.expander(f"Read more ({word_count} words)", expanded=expanded):
         st.markdown(content)
@@ -7,9 +7,12 @@ import streamlit as st
 import sys
 from pathlib import Path
 
-src_path = Path(__file__).parent.parent / "src"
-if str(src_path) not in sys.path:
-    sys.path.insert(0, str(src_path))
+# Streamlit re-executes this script on every rerun, so module globals do not
+# survive; after the first run src/ is already at the front of sys.path and
+# the check stops there instead of scanning the whole list.
+src_path = str(Path(__file__).parent.parent / "src")
+if sys.path[:1] != [src_path] and src_path not in sys.path:
+    sys.path.insert(0, src_path)
 
 from utils import Config
 
@@ -22,7 +25,14 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-st.markdown("""
+_STATUS_LABEL = {
+    "uploaded": "Uploaded",
+    "processing": "Processing",
+    "completed": "Completed",
+    "failed": "Failed",
+}
+
+_GLOBAL_CSS = """
 <style>
     .main { padding: 1rem; }
     .main-header { font-size: 2.5rem; font-weight: 700; color: #1f2937; margin-bottom: 0.5rem; }
@@ -30,11 +40,89 @@ st.markdown("""
     #MainMenu {visibility: hidden;}
     footer {visibility: hidden;}
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+def _inject_css():
+    """Emit the global stylesheet."""
+    # Streamlit drops elements that a rerun does not emit again, so the
+    # block is sent every run; only the string itself is built once.
+    st.markdown(_GLOBAL_CSS, unsafe_allow_html=True)
+
+
+@st.cache_resource
+def _get_db():
+    """Get the database handler shared across reruns and sessions."""
+    from storage import DatabaseHandler
+    return DatabaseHandler(config)
+
+
+@st.cache_data(ttl="30s", max_entries=4, show_spinner=False)
+def _cached_stats(_db):
+    """Get database statistics, refreshed at most every 30 seconds."""
+    return _db.get_statistics()
+
+
+@st.cache_data(ttl="1m", max_entries=4, show_spinner=False)
+def _cached_recent(_db, count: int):
+    """Get the most recent papers, refreshed at most every minute."""
+    return _db.get_recent_papers(count=count)
+
+
+@st.fragment
+def _stats_fragment():
+    """Render the Quick Stats block."""
+    try:
+        db = _get_db()
+        stats = _cached_stats(db)
+        
+        st.markdown("### Quick Stats")
+        
+        metric_col1, metric_col2 = st.columns(2)
+        with metric_col1:
+            st.metric("Papers", stats.get("total_papers", 0))
+        with metric_col2:
+            st.metric("Sections", stats.get("total_sections", 0))
+        
+        metric_col3, metric_col4 = st.columns(2)
+        with metric_col3:
+            st.metric("Images", stats.get("total_images", 0))
+        with metric_col4:
+            st.metric("Tables", stats.get("total_tables", 0))
+            
+    except Exception:
+        st.warning("Database not initialized yet. Upload a paper to get started.")
+
+
+@st.fragment
+def _recent_papers_fragment():
+    """Render the Recent Papers list."""
+    try:
+        db = _get_db()
+        recent_papers = _cached_recent(db, 5)
+        
+        if recent_papers:
+            for paper in recent_papers:
+                with st.container():
+                    col1, col2, col3 = st.columns([3, 1, 1])
+                    with col1:
+                        title = paper.title if paper.title else paper.filename
+                        st.markdown(f"**{title}**")
+                    with col2:
+                        st.caption(f"{paper.page_count} pages")
+                    with col3:
+                        status = paper.status.value
+                        st.caption(_STATUS_LABEL.get(status, status))
+        else:
+            st.info("No papers uploaded yet. Head to the Upload page to get started.")
+            
+    except Exception:
+        st.info("No papers uploaded yet. Head to the Upload page to get started.")
 
 
 def main():
     """Main application entry point."""
+    _inject_css()
     st.markdown('<p class="main-header">PaperIQ</p>', unsafe_allow_html=True)
     st.markdown(
         '<p class="sub-header">Research Paper Insight Analyzer - Upload and analyze research papers with AI-powered section detection</p>',
@@ -61,52 +149,12 @@ def main():
         st.info("Use the sidebar to navigate to the Upload page to get started.")
     
     with col2:
-        try:
-            from storage import DatabaseHandler
-            db = DatabaseHandler(config)
-            stats = db.get_statistics()
-            
-            st.markdown("### Quick Stats")
-            
-            metric_col1, metric_col2 = st.columns(2)
-            with metric_col1:
-                st.metric("Papers", stats.get("total_papers", 0))
-            with metric_col2:
-                st.metric("Sections", stats.get("total_sections", 0))
-            
-            metric_col3, metric_col4 = st.columns(2)
-            with metric_col3:
-                st.metric("Images", stats.get("total_images", 0))
-            with metric_col4:
-                st.metric("Tables", stats.get("total_tables", 0))
-                
-        except Exception:
-            st.warning("Database not initialized yet. Upload a paper to get started.")
+        _stats_fragment()
     
     st.markdown("---")
     st.markdown("### Recent Papers")
     
-    try:
-        from storage import DatabaseHandler
-        db = DatabaseHandler(config)
-        recent_papers = db.get_recent_papers(count=5)
-        
-        if recent_papers:
-            for paper in recent_papers:
-                with st.container():
-                    col1, col2, col3 = st.columns([3, 1, 1])
-                    with col1:
-                        title = paper.title if paper.title else paper.filename
-                        st.markdown(f"**{title}**")
-                    with col2:
-                        st.caption(f"{paper.page_count} pages")
-                    with col3:
-                        st.caption(f"{paper.status.value.capitalize()}")
-        else:
-            st.info("No papers uploaded yet. Head to the Upload page to get started.")
-            
-    except Exception:
-        st.info("No papers uploaded yet. Head to the Upload page to get started.")
+    _recent_papers_fragment()
 
 
 if __name__ == "__main__":
@@ -3,14 +3,20 @@ Upload Page - PDF Upload and Processing
 """
 
 import streamlit as st
+import hashlib
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-src_path = Path(__file__).parent.parent.parent / "src"
-if str(src_path) not in sys.path:
-    sys.path.insert(0, str(src_path))
+# Checked on every rerun; once src/ is at the front of sys.path the test
+# stops there instead of scanning the whole list.
+src_path = str(Path(__file__).parent.parent.parent / "src")
+if sys.path[:1] != [src_path] and src_path not in sys.path:
+    sys.path.insert(0, src_path)
 
-from utils import Config, PDFValidator, get_logger
+from utils import Config, PDFValidator, get_logger, log_stage
 from models import Paper, ProcessingStatus, ValidationReport, SectionType
 from parsers import PDFExtractor, SectionDetector, ImageHandler, TableHandler
 from storage import DatabaseHandler, FileManager
@@ -20,105 +26,212 @@ logger = get_logger("paperiq.upload")
 
 st.set_page_config(page_title="Upload - PaperIQ", page_icon="docs", layout="wide")
 
+# Display label per section type, used in validation check names
+SECTION_LABEL = {section_type: section_type.value.capitalize() for section_type in SectionType}
 
-def process_paper(uploaded_file):
+
+# Handlers hold no per-upload state (the database opens a connection per
+# call), so one instance of each is shared across reruns and sessions.
+@st.cache_resource
+def _get_validator():
+    """Get the shared PDF validator."""
+    return PDFValidator(config)
+
+
+@st.cache_resource
+def _get_db():
+    """Get the shared database handler."""
+    return DatabaseHandler(config)
+
+
+@st.cache_resource
+def _get_file_manager():
+    """Get the shared file manager."""
+    return FileManager(config)
+
+
+@st.cache_resource
+def _get_pdf_extractor():
+    """Get the shared PDF text extractor."""
+    return PDFExtractor(config)
+
+
+@st.cache_resource
+def _get_section_detector():
+    """Get the shared section detector."""
+    return SectionDetector(config)
+
+
+@st.cache_resource
+def _get_image_handler():
+    """Get the shared image handler."""
+    return ImageHandler(config)
+
+
+@st.cache_resource
+def _get_table_handler():
+    """Get the shared table handler."""
+    return TableHandler(config)
+
+
+def _persist_results(db, paper):
+    """Store a processed paper's sections, images and tables in one transaction."""
+    with log_stage("persist", logger), db.transaction():
+        db.insert_sections(paper.sections)
+        if paper.images:
+            db.insert_images(paper.images)
+        if paper.tables:
+            db.insert_tables(paper.tables)
+        db.update_paper(paper)
+
+
+@st.cache_data(ttl="10s", max_entries=4, show_spinner=False)
+def _cached_recent(_db, count: int):
+    """Recent papers for the sidebar; cleared after each successful upload."""
+    return _db.get_recent_papers(count=count)
+
+
+def process_paper(uploaded_file, extract_images=True, extract_tables=True):
     """Process an uploaded PDF file through the complete pipeline."""
-    validator = PDFValidator(config)
-    db = DatabaseHandler(config)
-    file_manager = FileManager(config)
-    pdf_extractor = PDFExtractor(config)
-    section_detector = SectionDetector(config)
-    image_handler = ImageHandler(config)
-    table_handler = TableHandler(config)
+    validator = _get_validator()
+    db = _get_db()
+    file_manager = _get_file_manager()
+    pdf_extractor = _get_pdf_extractor()
+    section_detector = _get_section_detector()
+    image_handler = _get_image_handler()
+    table_handler = _get_table_handler()
     
-    progress_bar = st.progress(0)
-    status_text = st.empty()
+    status = st.status("Processing PDF...", expanded=True)
     paper_id = None
+    staged_path = None
+    started = time.perf_counter()
     
     try:
-        status_text.text("Validating PDF...")
-        progress_bar.progress(5)
+        status.write("Saving file...")
         
-        validation_result = validator.validate_uploaded_file(uploaded_file, uploaded_file.name)
+        # Write the upload to disk once and validate the copy there, instead of
+        # passing the in-memory buffer through every stage
+        hasher = hashlib.sha256()
+        with log_stage("save", logger):
+            staged_path, file_size = file_manager.save_uploaded_file(
+                uploaded_file, uploaded_file.name, hasher=hasher
+            )
+        content_sha256 = hasher.hexdigest()
+        
+        # Identical content was already processed with at least the requested
+        # options; reuse those results
+        existing_id = db.find_paper_by_sha256(
+            content_sha256, images=extract_images, tables=extract_tables
+        )
+        if existing_id is not None:
+            staged_path.unlink(missing_ok=True)
+            logger.info("Duplicate upload of paper ID %d: %s", existing_id, uploaded_file.name)
+            status.update(label="Already processed", state="complete", expanded=False)
+            return True, existing_id, "This paper was already processed - showing the existing results."
+        
+        status.write("Validating PDF...")
+        
+        with log_stage("validate", logger):
+            validation_result = validator.validate_file(staged_path)
         if not validation_result.is_valid:
+            staged_path.unlink(missing_ok=True)
+            status.update(label="Validation failed", state="error")
             return False, None, f"Validation failed: {validation_result.message}"
         
-        progress_bar.progress(10)
-        status_text.text("Creating paper record...")
+        status.write("Extracting text...")
         
         paper = Paper(
             filename=uploaded_file.name,
             status=ProcessingStatus.PROCESSING,
-            file_size_bytes=validation_result.details.get("size_bytes", 0)
+            file_size_bytes=file_size,
+            content_sha256=content_sha256,
+            images_extracted=extract_images,
+            tables_extracted=extract_tables
         )
-        paper_id = db.insert_paper(paper)
-        paper.id = paper_id
         
-        progress_bar.progress(15)
-        status_text.text("Saving file...")
+        # Text extraction only needs the staged file, so the paper record is
+        # inserted alongside it; the ID is needed from the rename onwards
+        with log_stage("extract_text", logger), ThreadPoolExecutor(max_workers=1) as executor:
+            insert_future = executor.submit(db.insert_paper, paper)
+            try:
+                extraction_result = pdf_extractor.extract(
+                    staged_path,
+                    num_workers=min(os.cpu_count() or 1, config.pdf_workers),
+                    pages_per_task=config.pages_per_task,
+                )
+            finally:
+                paper_id = insert_future.result()
+        paper.id = paper_id
         
-        saved_path, file_size = file_manager.save_uploaded_file(uploaded_file, uploaded_file.name, paper_id)
+        saved_path = file_manager.promote_staged_file(staged_path, paper_id)
+        staged_path = None
         paper.file_path = str(saved_path)
-        paper.file_size_bytes = file_size
-        
-        progress_bar.progress(20)
-        status_text.text("Extracting text...")
         
-        extraction_result = pdf_extractor.extract(saved_path)
         if not extraction_result.success:
             db.update_paper_status(paper_id, ProcessingStatus.FAILED)
+            status.update(label="Text extraction failed", state="error")
             return False, paper_id, f"Text extraction failed: {extraction_result.error}"
         
         paper.page_count = extraction_result.page_count
         paper.title = extraction_result.title
         paper.full_text = extraction_result.full_text
         
-        progress_bar.progress(40)
-        status_text.text("Extracting images...")
+        stages = {
+            "sections": (section_detector.detect_sections, extraction_result.full_text, extraction_result.text_blocks, paper_id),
+        }
+        if extract_images:
+            stages["images"] = (image_handler.extract_images, saved_path, paper_id)
+        if extract_tables:
+            stages["tables"] = (table_handler.extract_tables, saved_path, paper_id)
+        status.write(f"Extracting {', '.join(stages)}...")
         
-        images = image_handler.extract_images(saved_path, paper_id)
-        paper.images = images
-        
-        progress_bar.progress(55)
-        status_text.text("Extracting tables...")
+        results = {}
+        if config.parallel_extract:
+            # The three stages only read the saved PDF and the extracted text, so
+            # they can overlap; widgets are still only updated from this thread
+            with log_stage("extract_content", logger), ThreadPoolExecutor(max_workers=len(stages)) as executor:
+                futures = {executor.submit(fn, *args): name for name, (fn, *args) in stages.items()}
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+                    status.write(f"Finished {futures[future]}")
+        else:
+            for name, (fn, *args) in stages.items():
+                status.write(f"Extracting {name}...")
+                with log_stage(f"extract_{name}", logger):
+                    results[name] = fn(*args)
         
-        tables = table_handler.extract_tables(saved_path, paper_id)
+        images = results.get("images", [])
+        tables = results.get("tables", [])
+        sections = results["sections"]
+        paper.images = images
         paper.tables = tables
-        
-        progress_bar.progress(70)
-        status_text.text("Identifying sections...")
-        
-        sections = section_detector.detect_sections(extraction_result.full_text, extraction_result.text_blocks)
-        for section in sections:
-            section.paper_id = paper_id
         paper.sections = sections
         
-        progress_bar.progress(85)
-        status_text.text("Generating validation report...")
-        
-        validation_report = generate_validation_report(paper, section_detector)
-        paper.validation_report = validation_report
+        status.write("Saving results...")
         
-        progress_bar.progress(90)
-        status_text.text("Saving results...")
+        paper.status = ProcessingStatus.COMPLETED
+        _persist_results(db, paper)
         
-        db.insert_sections(sections)
-        db.insert_images(images)
-        db.insert_tables(tables)
+        status.write("Generating validation report...")
         
-        paper.status = ProcessingStatus.COMPLETED
-        db.update_paper(paper)
+        with log_stage("validation_report", logger):
+            validation_report = generate_validation_report(paper, section_detector)
+        paper.validation_report = validation_report
         
-        progress_bar.progress(100)
-        status_text.text("Processing complete!")
+        status.update(label="Processing complete!", state="complete", expanded=False)
         
-        logger.info(f"Paper processed: {paper.filename} - {len(sections)} sections, {len(images)} images, {len(tables)} tables")
+        logger.info("Paper processed: %s - %d sections, %d images, %d tables", paper.filename, len(sections), len(images), len(tables))
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info("stage=total ms=%.1f pages=%d ms_per_page=%.1f", elapsed_ms, paper.page_count, elapsed_ms / max(paper.page_count, 1))
         return True, paper_id, "Paper processed successfully!"
         
     except Exception as e:
-        logger.error(f"Processing failed: {e}")
+        logger.exception("Processing failed")
         if paper_id:
             db.update_paper_status(paper_id, ProcessingStatus.FAILED)
+        if staged_path is not None:
+            staged_path.unlink(missing_ok=True)
+        status.update(label="Processing failed", state="error")
         return False, None, f"Processing error: {str(e)}"
 
 
@@ -126,30 +239,36 @@ def generate_validation_report(paper, section_detector):
     """Generate a validation report for a processed paper."""
     report = ValidationReport()
     
+    # Best-scoring section per type, built in one pass
+    by_type = {}
+    for s in paper.sections:
+        best = by_type.get(s.section_type)
+        if best is None or s.confidence > best.confidence:
+            by_type[s.section_type] = s
+    
     required_sections = [SectionType.ABSTRACT, SectionType.INTRODUCTION, SectionType.CONCLUSION]
-    found_types = {s.section_type for s in paper.sections}
     
     for section_type in required_sections:
-        if section_type in found_types:
-            section = next(s for s in paper.sections if s.section_type == section_type)
+        section = by_type.get(section_type)
+        if section is not None:
             if section.confidence >= 0.7:
-                report.add_check(f"{section_type.value.capitalize()} present", "pass", f"Found with {section.confidence:.0%} confidence")
+                report.add_check(f"{SECTION_LABEL[section_type]} present", "pass", f"Found with {section.confidence:.0%} confidence")
             else:
-                report.add_check(f"{section_type.value.capitalize()} present", "warning", f"Found but low confidence ({section.confidence:.0%})")
+                report.add_check(f"{SECTION_LABEL[section_type]} present", "warning", f"Found but low confidence ({section.confidence:.0%})")
         else:
-            report.add_check(f"{section_type.value.capitalize()} present", "fail", "Section not found")
+            report.add_check(f"{SECTION_LABEL[section_type]} present", "fail", "Section not found")
     
     optional_sections = [SectionType.METHODOLOGY, SectionType.RESULTS, SectionType.DISCUSSION, SectionType.REFERENCES]
     for section_type in optional_sections:
-        if section_type in found_types:
-            section = next(s for s in paper.sections if s.section_type == section_type)
-            report.add_check(f"{section_type.value.capitalize()} present", "pass", f"Found with {section.confidence:.0%} confidence")
+        section = by_type.get(section_type)
+        if section is not None:
+            report.add_check(f"{SECTION_LABEL[section_type]} present", "pass", f"Found with {section.confidence:.0%} confidence")
         else:
-            report.add_check(f"{section_type.value.capitalize()} present", "warning", "Section not found")
+            report.add_check(f"{SECTION_LABEL[section_type]} present", "warning", "Section not found")
     
     for section in paper.sections:
         if section.word_count < 10:
-            report.add_check(f"{section.section_type.value.capitalize()} content", "warning", f"Section may be too short ({section.word_count} words)")
+            report.add_check(f"{SECTION_LABEL[section.section_type]} content", "warning", f"Section may be too short ({section.word_count} words)")
     
     quality_score, quality_level = section_detector.calculate_detection_quality(paper.sections)
     report.quality_score = quality_score
@@ -166,16 +285,16 @@ def main():
     
     with st.sidebar:
         st.markdown("### Settings")
-        st.checkbox("Extract images", value=True, disabled=True)
-        st.checkbox("Extract tables", value=True, disabled=True)
+        st.checkbox("Extract images", value=True, key="extract_images")
+        st.checkbox("Extract tables", value=True, key="extract_tables")
         st.checkbox("Enable OCR (coming soon)", value=False, disabled=True)
         
         st.markdown("---")
         st.markdown("### Recent Papers")
         
         try:
-            db = DatabaseHandler(config)
-            recent_papers = db.get_recent_papers(count=5)
+            db = _get_db()
+            recent_papers = _cached_recent(db, 5)
             if recent_papers:
                 for paper in recent_papers:
                     title = paper.title[:30] + "..." if paper.title and len(paper.title) > 30 else (paper.title or paper.filename)
@@ -213,10 +332,14 @@ def main():
             st.markdown("---")
             
             if st.button("Parse Paper", type="primary", use_container_width=True):
-                with st.spinner("Processing..."):
-                    success, paper_id, message = process_paper(uploaded_file)
+                success, paper_id, message = process_paper(
+                    uploaded_file,
+                    extract_images=st.session_state.extract_images,
+                    extract_tables=st.session_state.extract_tables,
+                )
                 
                 if success:
+                    _cached_recent.clear()
                     st.success(message)
                     st.session_state["selected_paper_id"] = paper_id
                     st.markdown("---")
@@ -3,16 +3,23 @@ Results Page - View Parsing Results
 """
 
 import streamlit as st
+import io
+import math
+import os
 import sys
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 import pandas as pd
 
-src_path = Path(__file__).parent.parent.parent / "src"
-if str(src_path) not in sys.path:
-    sys.path.insert(0, str(src_path))
+# Checked on every rerun; once src/ is at the front of sys.path the test
+# stops there instead of scanning the whole list.
+src_path = str(Path(__file__).parent.parent.parent / "src")
+if sys.path[:1] != [src_path] and src_path not in sys.path:
+    sys.path.insert(0, src_path)
 
 from utils import Config, get_logger
-from models import SectionType
+from models import SectionType, ProcessingStatus
 from storage import DatabaseHandler, FileManager
 
 config = Config()
@@ -20,6 +27,181 @@ logger = get_logger("paperiq.results")
 
 st.set_page_config(page_title="Results - PaperIQ", page_icon="docs", layout="wide")
 
+# Items rendered per page in each tab
+SECTIONS_PER_PAGE = 10
+IMAGES_PER_PAGE = 9
+TABLES_PER_PAGE = 5
+
+# Section title and confidence badge, emitted as one element; the top border
+# replaces a separate "---" separator between sections
+_SECTION_HEADER_TMPL = (
+    '<div class="paperiq-section-header"><h3>{name}</h3>'
+    '<span class="paperiq-badge" style="background-color: {color};">{confidence:.0%}</span></div>'
+)
+
+# Shared styles for the section headers and validation checklist, so each
+# item only carries a class name
+_RESULTS_CSS = """
+<style>
+    .paperiq-section-header {
+        display: flex; justify-content: space-between; align-items: center;
+        border-top: 1px solid #e5e7eb; padding-top: 0.75rem; margin-top: 0.5rem;
+    }
+    .paperiq-section-header h3 { margin: 0; }
+    .paperiq-badge {
+        color: white; padding: 0.2rem 0.6rem; border-radius: 9999px; font-size: 0.8rem;
+    }
+    .paperiq-item { padding: 0.75rem 1rem; border-radius: 6px; margin-bottom: 0.5rem; }
+    .paperiq-item span { font-size: 0.9rem; opacity: 0.8; }
+    .paperiq-item-pass { background-color: #d1fae5; color: #065f46; }
+    .paperiq-item-warning { background-color: #fef3c7; color: #92400e; }
+    .paperiq-item-fail { background-color: #fee2e2; color: #991b1b; }
+</style>
+"""
+
+_SECTION_NAMES = {
+    SectionType.ABSTRACT: "Abstract",
+    SectionType.INTRODUCTION: "Introduction",
+    SectionType.METHODOLOGY: "Methodology",
+    SectionType.RESULTS: "Results",
+    SectionType.DISCUSSION: "Discussion",
+    SectionType.CONCLUSION: "Conclusion",
+    SectionType.REFERENCES: "References",
+    SectionType.UNKNOWN: "Unknown",
+}
+
+# Validation status -> (CSS class suffix, label); unknown statuses fail
+_CHECK_STYLES = {
+    "pass": ("pass", "[PASS]"),
+    "warning": ("warning", "[WARN]"),
+    "fail": ("fail", "[FAIL]"),
+}
+
+_CHECK_ITEM_TMPL = (
+    '<div class="paperiq-item paperiq-item-{style}">'
+    '{icon} <strong>{name}</strong><br><span>{message}</span></div>'
+)
+
+
+def _inject_css():
+    """Emit the page stylesheet."""
+    # Streamlit drops elements that a rerun does not emit again, so the
+    # block is sent every run rather than once per session.
+    st.markdown(_RESULTS_CSS, unsafe_allow_html=True)
+
+
+@st.cache_resource
+def _get_db():
+    """Get the shared database handler."""
+    return DatabaseHandler(config)
+
+
+@st.cache_resource
+def _get_file_manager():
+    """Get the shared file manager."""
+    return FileManager(config)
+
+
+@st.cache_data(ttl="1m", max_entries=32, show_spinner=False)
+def _load_papers(_db, limit: int):
+    """Paper summaries for the selector; cleared when a paper is deleted."""
+    return _db.get_paper_summaries(limit=limit)
+
+
+# Statuses after which a paper's stored results no longer change
+_FINAL_STATUSES = (ProcessingStatus.COMPLETED, ProcessingStatus.FAILED)
+
+
+@st.cache_data(ttl="5m", max_entries=32, show_spinner=False)
+def _load_paper_meta(_db, paper_id: int):
+    """Load a paper's metadata row only; cleared when a paper is deleted."""
+    return _db.get_paper(paper_id, include_content=False)
+
+
+@st.cache_data(ttl="5m", max_entries=16, show_spinner=False)
+def _load_paper_content(_db, paper_id: int):
+    """Load a paper's (sections, images, tables); cleared when a paper is deleted."""
+    return _db.get_sections(paper_id), _db.get_images(paper_id), _db.get_tables(paper_id)
+
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def _read_table_preview(path: str, mtime: float, nrows: int = 10):
+    """Read the first rows of a table CSV; mtime keys the cache to the file version."""
+    return pd.read_csv(path, nrows=nrows)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _read_bytes(path: str, mtime: float) -> bytes:
+    """Read a file's bytes for a download button; mtime keys the cache to the file version."""
+    return Path(path).read_bytes()
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def _get_thumbnail(path: str, mtime: float, max_px: int = 400) -> bytes:
+    """Encode a downscaled WEBP thumbnail; mtime keys the cache to the file version."""
+    from PIL import Image
+    
+    with Image.open(path) as image:
+        image.thumbnail((max_px, max_px))
+        buf = io.BytesIO()
+        image.save(buf, "WEBP", quality=80)
+    return buf.getvalue()
+
+
+@st.cache_data(ttl="10s", max_entries=64, show_spinner=False)
+def _path_mtimes(paths: tuple) -> tuple:
+    """Stat a batch of files; mtime per path, or None where the file is missing."""
+    mtimes = []
+    for path in paths:
+        try:
+            mtimes.append(os.stat(path).st_mtime)
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _preview_text(paper_id: int, _full_text: str, limit: int = 5000) -> str:
+    """Truncated raw text for a paper; keyed by ID so the text is never hashed."""
+    if len(_full_text) > limit:
+        return _full_text[:limit] + "..."
+    return _full_text
+
+
+@lru_cache(maxsize=256)
+def _format_paper_header(upload_ts, size_mb: float, status: str) -> str:
+    """Build the upload/size/status caption from primitive values."""
+    uploaded = datetime.fromtimestamp(upload_ts).strftime('%Y-%m-%d %H:%M') if upload_ts is not None else 'Unknown'
+    return f"Uploaded: {uploaded} | Size: {size_mb:.2f} MB | Status: {status.capitalize()}"
+
+
+def _shift_page(key: str, delta: int):
+    """Move a paginated list by delta pages (used as a button callback)."""
+    st.session_state[key] = st.session_state.get(key, 0) + delta
+
+
+def _current_page(key: str, item_count: int, per_page: int):
+    """Get the clamped (page, page_count) for a paginated list."""
+    page_count = max(math.ceil(item_count / per_page), 1)
+    page = min(max(st.session_state.get(key, 0), 0), page_count - 1)
+    st.session_state[key] = page
+    return page, page_count
+
+
+def _page_nav(key: str, page: int, page_count: int):
+    """Render Previous/Next controls for a paginated list."""
+    if page_count <= 1:
+        return
+    prev_col, info_col, next_col = st.columns([1, 2, 1])
+    with prev_col:
+        st.button("Previous", key=f"{key}_prev", disabled=page == 0,
+                  on_click=_shift_page, args=(key, -1), use_container_width=True)
+    with info_col:
+        st.caption(f"Page {page + 1} of {page_count}")
+    with next_col:
+        st.button("Next", key=f"{key}_next", disabled=page >= page_count - 1,
+                  on_click=_shift_page, args=(key, 1), use_container_width=True)
+
 
 def get_confidence_color(confidence):
     """Get color based on confidence level."""
@@ -32,29 +214,13 @@ def get_confidence_color(confidence):
 
 def display_section(section):
     """Display a single section with expandable content."""
-    section_names = {
-        SectionType.ABSTRACT: "Abstract",
-        SectionType.INTRODUCTION: "Introduction",
-        SectionType.METHODOLOGY: "Methodology",
-        SectionType.RESULTS: "Results",
-        SectionType.DISCUSSION: "Discussion",
-        SectionType.CONCLUSION: "Conclusion",
-        SectionType.REFERENCES: "References",
-        SectionType.UNKNOWN: "Unknown",
-    }
-    
-    name = section_names.get(section.section_type, "Section")
+    name = _SECTION_NAMES.get(section.section_type, "Section")
     color = get_confidence_color(section.confidence)
     
-    col1, col2 = st.columns([3, 1])
-    with col1:
-        st.markdown(f"### {name}")
-    with col2:
-        st.markdown(
-            f'<span style="background-color: {color}; color: white; padding: 0.2rem 0.6rem; '
-            f'border-radius: 9999px; font-size: 0.8rem;">{section.confidence:.0%}</span>',
-            unsafe_allow_html=True
-        )
+    st.markdown(
+        _SECTION_HEADER_TMPL.format(name=name, color=color, confidence=section.confidence),
+        unsafe_allow_html=True
+    )
     
     with st.expander("Read more", expanded=False):
         st.markdown(section.content)
@@ -67,37 +233,40 @@ def display_images(images):
         st.info("No images found in this paper.")
         return
     
+    mtimes = _path_mtimes(tuple(img.file_path for img in images))
+    
+    # One set of columns for the whole grid; images are dealt across them in
+    # reading order instead of creating a new column block per row
     cols_per_row = 3
-    for i in range(0, len(images), cols_per_row):
-        cols = st.columns(cols_per_row)
-        for j, col in enumerate(cols):
-            if i + j < len(images):
-                img = images[i + j]
-                img_path = Path(img.file_path)
-                with col:
-                    if img_path.exists():
-                        st.image(str(img_path), caption=f"Page {img.page_number}")
-                        st.caption(f"{img.dimensions} - {img.format}")
-                    else:
-                        st.warning(f"Image not found: {img.filename}")
-
-
-def display_tables(tables):
-    """Display extracted tables with previews."""
+    cols = st.columns(cols_per_row)
+    for idx, (img, mtime) in enumerate(zip(images, mtimes)):
+        with cols[idx % cols_per_row]:
+            if mtime is not None:
+                thumbnail = _get_thumbnail(img.file_path, mtime)
+                st.image(thumbnail, caption=f"Page {img.page_number}")
+                st.caption(f"{img.dimensions} - {img.format}")
+            else:
+                st.warning(f"Image not found: {img.filename}")
+
+
+def display_tables(tables, start=0):
+    """Display extracted tables with previews, numbered from start + 1."""
     if not tables:
         st.info("No tables found in this paper.")
         return
     
-    for i, table in enumerate(tables):
+    mtimes = _path_mtimes(tuple(table.file_path for table in tables))
+    
+    for i, (table, mtime) in enumerate(zip(tables, mtimes), start):
         with st.expander(f"Table {i + 1} (Page {table.page_number}) - {table.dimensions}"):
             csv_path = Path(table.file_path)
-            if csv_path.exists():
+            if mtime is not None:
                 try:
-                    df = pd.read_csv(csv_path)
-                    st.dataframe(df.head(10), use_container_width=True)
+                    df = _read_table_preview(table.file_path, mtime)
+                    st.dataframe(df, use_container_width=True)
                     st.download_button(
                         label="Download CSV",
-                        data=csv_path.read_bytes(),
+                        data=_read_bytes(table.file_path, mtime),
                         file_name=csv_path.name,
                         mime="text/csv",
                         key=f"download_table_{i}"
@@ -134,31 +303,81 @@ def display_validation(paper):
     st.markdown("---")
     st.markdown("### Validation Checklist")
     
+    items_html = []
     for item in report.items:
-        if item.status == "pass":
-            bg_color, text_color, icon = "#d1fae5", "#065f46", "[PASS]"
-        elif item.status == "warning":
-            bg_color, text_color, icon = "#fef3c7", "#92400e", "[WARN]"
-        else:
-            bg_color, text_color, icon = "#fee2e2", "#991b1b", "[FAIL]"
-        
-        st.markdown(f"""
-        <div style="background-color: {bg_color}; padding: 0.75rem 1rem; border-radius: 6px; margin-bottom: 0.5rem; color: {text_color};">
-            {icon} <strong>{item.name}</strong><br>
-            <span style="font-size: 0.9rem; opacity: 0.8;">{item.message}</span>
-        </div>
-        """, unsafe_allow_html=True)
+        style, icon = _CHECK_STYLES.get(item.status, _CHECK_STYLES["fail"])
+        items_html.append(_CHECK_ITEM_TMPL.format(
+            style=style, icon=icon, name=item.name, message=item.message,
+        ))
+    
+    # One element for the whole checklist instead of one per item
+    st.markdown("".join(items_html), unsafe_allow_html=True)
+
+
+# Each tab body is a fragment, so widgets inside it (expanders, download
+# buttons) rerun only that tab instead of the whole page.
+@st.fragment
+def _sections_tab(paper):
+    """Render the Sections tab."""
+    if paper.sections:
+        st.markdown(f"**{len(paper.sections)} sections identified**")
+        st.markdown("---")
+        page, page_count = _current_page("sections_page", len(paper.sections), SECTIONS_PER_PAGE)
+        start = page * SECTIONS_PER_PAGE
+        for section in paper.sections[start:start + SECTIONS_PER_PAGE]:
+            display_section(section)
+        _page_nav("sections_page", page, page_count)
+    else:
+        st.warning("No sections were identified in this paper.")
+        if paper.full_text:
+            with st.expander("View raw text"):
+                st.text(_preview_text(paper.id, paper.full_text))
+
+
+@st.fragment
+def _images_tab(paper):
+    """Render the Images tab."""
+    st.markdown(f"**{len(paper.images)} images extracted**")
+    st.markdown("---")
+    page, page_count = _current_page("images_page", len(paper.images), IMAGES_PER_PAGE)
+    start = page * IMAGES_PER_PAGE
+    display_images(paper.images[start:start + IMAGES_PER_PAGE])
+    _page_nav("images_page", page, page_count)
+
+
+@st.fragment
+def _tables_tab(paper):
+    """Render the Tables tab."""
+    st.markdown(f"**{len(paper.tables)} tables extracted**")
+    st.markdown("---")
+    page, page_count = _current_page("tables_page", len(paper.tables), TABLES_PER_PAGE)
+    start = page * TABLES_PER_PAGE
+    display_tables(paper.tables[start:start + TABLES_PER_PAGE], start)
+    _page_nav("tables_page", page, page_count)
+
+
+@st.fragment
+def _validation_tab(paper):
+    """Render the Validation tab."""
+    display_validation(paper)
 
 
 def main():
     """Main results page."""
+    _inject_css()
     st.markdown("# Parsing Results")
     
-    db = DatabaseHandler(config)
+    db = _get_db()
     
     with st.sidebar:
         st.markdown("### Select Paper")
-        papers = db.get_all_papers(limit=20)
+        papers = _load_papers(db, 20)
+        
+        # A paper uploaded since the list was cached is not in it yet
+        requested_id = st.session_state.get("selected_paper_id")
+        if requested_id is not None and requested_id not in {p.id for p in papers}:
+            _load_papers.clear()
+            papers = _load_papers(db, 20)
         
         if not papers:
             st.info("No papers processed yet.")
@@ -168,18 +387,37 @@ def main():
             return
         
         paper_options = {f"{p.title or p.filename} ({p.status.value})": p.id for p in papers}
-        selected_name = st.selectbox("Choose a paper", options=list(paper_options.keys()), index=0)
-        selected_id = paper_options[selected_name]
+        option_ids = list(paper_options.values())
         
-        if "selected_paper_id" in st.session_state:
-            if st.session_state["selected_paper_id"] in [p.id for p in papers]:
-                selected_id = st.session_state["selected_paper_id"]
-    
-    paper = db.get_paper(selected_id, include_content=True)
+        # Open the selector on the requested paper, then remember whatever the
+        # user picks so the two can never disagree
+        index = option_ids.index(requested_id) if requested_id in option_ids else 0
+        selected_name = st.selectbox("Choose a paper", options=list(paper_options.keys()), index=index)
+        selected_id = paper_options[selected_name]
+        st.session_state["selected_paper_id"] = selected_id
     
-    if not paper:
-        st.error("Paper not found.")
-        return
+    # Keep the selected paper in the session so reruns for the same paper
+    # skip unpickling it from st.cache_data; only one paper is held at a time.
+    # Papers still being processed are read straight from the database so no
+    # partial copy is cached
+    cached = st.session_state.get("results_paper")
+    if cached is not None and cached[0] == selected_id:
+        paper = cached[1]
+    else:
+        paper = _load_paper_meta(db, selected_id)
+        if paper is not None and paper.status in _FINAL_STATUSES:
+            paper.sections, paper.images, paper.tables = _load_paper_content(db, selected_id)
+        else:
+            paper = db.get_paper(selected_id)
+        
+        if not paper:
+            st.error("Paper not found.")
+            return
+        
+        if paper.status in _FINAL_STATUSES:
+            st.session_state["results_paper"] = (selected_id, paper)
+        else:
+            st.session_state.pop("results_paper", None)
     
     st.markdown("---")
     
@@ -198,37 +436,26 @@ def main():
     else:
         st.markdown(f"### {paper.filename}")
     
-    st.caption(f"Uploaded: {paper.upload_date.strftime('%Y-%m-%d %H:%M') if paper.upload_date else 'Unknown'} | Size: {paper.file_size_mb:.2f} MB | Status: {paper.status.value.capitalize()}")
+    st.caption(_format_paper_header(
+        paper.upload_date.timestamp() if paper.upload_date else None,
+        paper.file_size_mb,
+        paper.status.value,
+    ))
     
     st.markdown("---")
     
-    tab_sections, tab_images, tab_tables, tab_validation = st.tabs(["Sections", "Images", "Tables", "Validation"])
-    
-    with tab_sections:
-        if paper.sections:
-            st.markdown(f"**{len(paper.sections)} sections identified**")
-            st.markdown("---")
-            for section in paper.sections:
-                display_section(section)
-                st.markdown("---")
-        else:
-            st.warning("No sections were identified in this paper.")
-            if paper.full_text:
-                with st.expander("View raw text"):
-                    st.text(paper.full_text[:5000] + "..." if len(paper.full_text) > 5000 else paper.full_text)
-    
-    with tab_images:
-        st.markdown(f"**{len(paper.images)} images extracted**")
-        st.markdown("---")
-        display_images(paper.images)
-    
-    with tab_tables:
-        st.markdown(f"**{len(paper.tables)} tables extracted**")
-        st.markdown("---")
-        display_tables(paper.tables)
+    # Only build tabs for content the paper actually has
+    tab_defs = [("Sections", _sections_tab)]
+    if paper.images:
+        tab_defs.append(("Images", _images_tab))
+    if paper.tables:
+        tab_defs.append(("Tables", _tables_tab))
+    tab_defs.append(("Validation", _validation_tab))
     
-    with tab_validation:
-        display_validation(paper)
+    tabs = st.tabs([name for name, _ in tab_defs])
+    for (_, render_tab), tab in zip(tab_defs, tabs):
+        with tab:
+            render_tab(paper)
     
     st.markdown("---")
     
@@ -241,9 +468,12 @@ def main():
     with col3:
         if st.button("Delete Paper", use_container_width=True):
             if st.session_state.get("confirm_delete", False):
-                file_manager = FileManager(config)
-                file_manager.delete_paper_files(paper.id)
+                _get_file_manager().delete_paper_files(paper.id)
                 db.delete_paper(paper.id)
+                _load_papers.clear()
+                _load_paper_meta.clear()
+                _load_paper_content.clear()
+                st.session_state.pop("results_paper", None)
                 st.success("Paper deleted!")
                 st.session_state["confirm_delete"] = False
                 st.rerun()
@@ -9,6 +9,7 @@ from models.paper_model import (
     ExtractedImage,
     ExtractedTable,
     TextBlock,
+    TextBlockArray,
     ProcessingStatus,
     ValidationReport,
     ValidationItem,
@@ -21,6 +22,7 @@ __all__ = [
     "ExtractedImage",
     "ExtractedTable",
     "TextBlock",
+    "TextBlockArray",
     "ProcessingStatus",
     "ValidationReport",
     "ValidationItem",
@@ -5,11 +5,14 @@ Defines data classes for papers, sections, images, tables, and validation.
 Uses Python dataclasses for clean, type-safe data structures.
 """
 
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Iterator
+
+import numpy as np
 
 
 class ProcessingStatus(Enum):
@@ -42,11 +45,7 @@ class SectionType(Enum):
         Returns:
             Matching SectionType or UNKNOWN
         """
-        value_lower = value.lower().strip()
-        for section_type in cls:
-            if section_type.value == value_lower:
-                return section_type
-        return cls.UNKNOWN
+        return _SECTION_TYPE_BY_VALUE.get(value.lower().strip(), cls.UNKNOWN)
     
     @classmethod
     def all_expected(cls) -> List["SectionType"]:
@@ -54,7 +53,11 @@ class SectionType(Enum):
         return [s for s in cls if s != cls.UNKNOWN]
 
 
-@dataclass
+# Value -> member lookup for SectionType.from_string
+_SECTION_TYPE_BY_VALUE: Dict[str, SectionType] = {s.value: s for s in SectionType}
+
+
+@dataclass(slots=True)
 class TextBlock:
     """
     A block of text with layout information.
@@ -73,6 +76,16 @@ class TextBlock:
     is_bold: bool = False
     is_italic: bool = False
     
+    _DICT_FIELDS = (
+        "text", "x0", "y0", "x1", "y1", "page_number",
+        "font_size", "font_name", "is_bold", "is_italic",
+    )
+    
+    def __post_init__(self):
+        """Share one string object per font name across blocks."""
+        if self.font_name:
+            self.font_name = sys.intern(self.font_name)
+    
     @property
     def width(self) -> float:
         """Width of the text block."""
@@ -90,21 +103,118 @@ class TextBlock:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for storage."""
-        return {
-            "text": self.text,
-            "x0": self.x0,
-            "y0": self.y0,
-            "x1": self.x1,
-            "y1": self.y1,
-            "page_number": self.page_number,
-            "font_size": self.font_size,
-            "font_name": self.font_name,
-            "is_bold": self.is_bold,
-            "is_italic": self.is_italic,
-        }
+        return {k: getattr(self, k) for k in self._DICT_FIELDS}
 
 
-@dataclass
+@dataclass(slots=True)
+class TextBlockArray:
+    """
+    Column-oriented (structure of arrays) view of many TextBlocks.
+    
+    Layout attributes live in parallel NumPy arrays so filters over a
+    whole document run as vectorized operations, e.g.
+    ``(blocks.font_size > 14) & blocks.is_bold``.
+    """
+    text: List[str]
+    x0: np.ndarray  # float32
+    y0: np.ndarray
+    x1: np.ndarray
+    y1: np.ndarray
+    page_number: np.ndarray  # int32
+    font_size: np.ndarray  # float32
+    font_name: List[str]
+    is_bold: np.ndarray  # bool
+    is_italic: np.ndarray
+    
+    @classmethod
+    def from_blocks(cls, blocks: Iterable[TextBlock]) -> "TextBlockArray":
+        """
+        Build the columns from TextBlock objects.
+        
+        Args:
+            blocks: TextBlocks in document order
+            
+        Returns:
+            TextBlockArray with one row per block
+        """
+        blocks = list(blocks)
+        count = len(blocks)
+        
+        def column(attr: str, dtype) -> np.ndarray:
+            return np.fromiter((getattr(b, attr) for b in blocks), dtype=dtype, count=count)
+        
+        return cls(
+            text=[b.text for b in blocks],
+            x0=column("x0", np.float32),
+            y0=column("y0", np.float32),
+            x1=column("x1", np.float32),
+            y1=column("y1", np.float32),
+            page_number=column("page_number", np.int32),
+            font_size=column("font_size", np.float32),
+            font_name=[b.font_name for b in blocks],
+            is_bold=column("is_bold", np.bool_),
+            is_italic=column("is_italic", np.bool_),
+        )
+    
+    @classmethod
+    def empty(cls) -> "TextBlockArray":
+        """An array with no blocks."""
+        return cls.from_blocks(())
+    
+    @classmethod
+    def concatenate(cls, arrays: Iterable["TextBlockArray"]) -> "TextBlockArray":
+        """
+        Join arrays end to end (e.g. one per page).
+        
+        Args:
+            arrays: TextBlockArrays in document order
+            
+        Returns:
+            TextBlockArray with the rows of all inputs
+        """
+        arrays = list(arrays)
+        if not arrays:
+            return cls.empty()
+        
+        return cls(
+            text=[t for a in arrays for t in a.text],
+            x0=np.concatenate([a.x0 for a in arrays]),
+            y0=np.concatenate([a.y0 for a in arrays]),
+            x1=np.concatenate([a.x1 for a in arrays]),
+            y1=np.concatenate([a.y1 for a in arrays]),
+            page_number=np.concatenate([a.page_number for a in arrays]),
+            font_size=np.concatenate([a.font_size for a in arrays]),
+            font_name=[f for a in arrays for f in a.font_name],
+            is_bold=np.concatenate([a.is_bold for a in arrays]),
+            is_italic=np.concatenate([a.is_italic for a in arrays]),
+        )
+    
+    def __len__(self) -> int:
+        """Number of blocks."""
+        return len(self.text)
+    
+    def block(self, index: int) -> TextBlock:
+        """Materialize a single row as a TextBlock."""
+        return TextBlock(
+            text=self.text[index],
+            x0=float(self.x0[index]),
+            y0=float(self.y0[index]),
+            x1=float(self.x1[index]),
+            y1=float(self.y1[index]),
+            page_number=int(self.page_number[index]),
+            font_size=float(self.font_size[index]),
+            font_name=self.font_name[index],
+            is_bold=bool(self.is_bold[index]),
+            is_italic=bool(self.is_italic[index]),
+        )
+    
+    def iter_blocks(self) -> Iterator[TextBlock]:
+        """Yield the rows as TextBlock objects, in order."""
+        for index in range(len(self.text)):
+            yield self.block(index)
+
+
+@dataclass(slots=True)
 class Section:
     """
     A section of a research paper.
@@ -120,6 +230,15 @@ class Section:
     end_position: int = 0
     word_count: int = 0
     
+    _DICT_FIELDS = (
+        "id", "paper_id", "section_type", "content", "confidence",
+        "start_position", "end_position", "word_count",
+    )
+    _FROM_DICT_DEFAULTS = {
+        "id": None, "paper_id": None, "section_type": "unknown", "content": "",
+        "confidence": 0.0, "start_position": 0, "end_position": 0, "word_count": 0,
+    }
+    
     def __post_init__(self):
         """Calculate word count if not provided."""
         if self.word_count == 0 and self.content:
@@ -146,33 +265,19 @@ class Section:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for storage."""
-        return {
-            "id": self.id,
-            "paper_id": self.paper_id,
-            "section_type": self.section_type.value,
-            "content": self.content,
-            "confidence": self.confidence,
-            "start_position": self.start_position,
-            "end_position": self.end_position,
-            "word_count": self.word_count,
-        }
+        data = {k: getattr(self, k) for k in self._DICT_FIELDS}
+        data["section_type"] = self.section_type.value
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Section":
         """Create Section from dictionary."""
-        return cls(
-            id=data.get("id"),
-            paper_id=data.get("paper_id"),
-            section_type=SectionType.from_string(data.get("section_type", "unknown")),
-            content=data.get("content", ""),
-            confidence=data.get("confidence", 0.0),
-            start_position=data.get("start_position", 0),
-            end_position=data.get("end_position", 0),
-            word_count=data.get("word_count", 0),
-        )
+        kwargs = {k: data.get(k, default) for k, default in cls._FROM_DICT_DEFAULTS.items()}
+        kwargs["section_type"] = SectionType.from_string(kwargs["section_type"])
+        return cls(**kwargs)
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractedImage:
     """
     An image extracted from a research paper.
@@ -187,6 +292,17 @@ class ExtractedImage:
     height: int = 0
     format: str = "PNG"
     
+    _DICT_FIELDS = ("id", "paper_id", "file_path", "page_number", "width", "height", "format")
+    _FROM_DICT_DEFAULTS = {
+        "id": None, "paper_id": None, "file_path": "", "page_number": 0,
+        "width": 0, "height": 0, "format": "PNG",
+    }
+    
+    def __post_init__(self):
+        """Share one string object per format name across images."""
+        if self.format:
+            self.format = sys.intern(self.format)
+    
     @property
     def dimensions(self) -> str:
         """Get dimensions as string."""
@@ -199,31 +315,15 @@ class ExtractedImage:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for storage."""
-        return {
-            "id": self.id,
-            "paper_id": self.paper_id,
-            "file_path": self.file_path,
-            "page_number": self.page_number,
-            "width": self.width,
-            "height": self.height,
-            "format": self.format,
-        }
+        return {k: getattr(self, k) for k in self._DICT_FIELDS}
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ExtractedImage":
         """Create ExtractedImage from dictionary."""
-        return cls(
-            id=data.get("id"),
-            paper_id=data.get("paper_id"),
-            file_path=data.get("file_path", ""),
-            page_number=data.get("page_number", 0),
-            width=data.get("width", 0),
-            height=data.get("height", 0),
-            format=data.get("format", "PNG"),
-        )
+        return cls(**{k: data.get(k, default) for k, default in cls._FROM_DICT_DEFAULTS.items()})
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractedTable:
     """
     A table extracted from a research paper.
@@ -238,6 +338,15 @@ class ExtractedTable:
     column_count: int = 0
     preview: str = ""  # First few rows as text
     
+    _DICT_FIELDS = (
+        "id", "paper_id", "file_path", "page_number",
+        "row_count", "column_count", "preview",
+    )
+    _FROM_DICT_DEFAULTS = {
+        "id": None, "paper_id": None, "file_path": "", "page_number": 0,
+        "row_count": 0, "column_count": 0, "preview": "",
+    }
+    
     @property
     def dimensions(self) -> str:
         """Get dimensions as string."""
@@ -250,31 +359,23 @@ class ExtractedTable:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for storage."""
-        return {
-            "id": self.id,
-            "paper_id": self.paper_id,
-            "file_path": self.file_path,
-            "page_number": self.page_number,
-            "row_count": self.row_count,
-            "column_count": self.column_count,
-            "preview": self.preview,
-        }
+        return {k: getattr(self, k) for k in self._DICT_FIELDS}
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ExtractedTable":
         """Create ExtractedTable from dictionary."""
-        return cls(
-            id=data.get("id"),
-            paper_id=data.get("paper_id"),
-            file_path=data.get("file_path", ""),
-            page_number=data.get("page_number", 0),
-            row_count=data.get("row_count", 0),
-            column_count=data.get("column_count", 0),
-            preview=data.get("preview", ""),
-        )
+        return cls(**{k: data.get(k, default) for k, default in cls._FROM_DICT_DEFAULTS.items()})
+
 
+# Icons for ValidationItem.status values
+_STATUS_ICONS: Dict[str, str] = {
+    "pass": "✅",
+    "warning": "⚠️",
+    "fail": "❌",
+}
 
-@dataclass
+
+@dataclass(slots=True)
 class ValidationItem:
     """Single validation check result."""
     name: str
@@ -284,15 +385,10 @@ class ValidationItem:
     @property
     def icon(self) -> str:
         """Get status icon."""
-        icons = {
-            "pass": "✅",
-            "warning": "⚠️",
-            "fail": "❌",
-        }
-        return icons.get(self.status, "❓")
+        return _STATUS_ICONS.get(self.status, "❓")
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationReport:
     """
     Validation report for a parsed paper.
@@ -302,42 +398,49 @@ class ValidationReport:
     items: List[ValidationItem] = field(default_factory=list)
     quality_score: float = 0.0
     quality_level: str = "unknown"
+    _counts: Dict[str, int] = field(init=False, repr=False, compare=False)
+    
+    _DICT_FIELDS = ("quality_score", "quality_level", "pass_count", "warning_count", "fail_count")
+    
+    def __post_init__(self):
+        """Tally the statuses of any items passed in; add_check keeps it current."""
+        self._counts = {"pass": 0, "warning": 0, "fail": 0}
+        for item in self.items:
+            self._counts[item.status] = self._counts.get(item.status, 0) + 1
     
     @property
     def pass_count(self) -> int:
         """Number of passed checks."""
-        return sum(1 for item in self.items if item.status == "pass")
+        return self._counts["pass"]
     
     @property
     def warning_count(self) -> int:
         """Number of warnings."""
-        return sum(1 for item in self.items if item.status == "warning")
+        return self._counts["warning"]
     
     @property
     def fail_count(self) -> int:
         """Number of failed checks."""
-        return sum(1 for item in self.items if item.status == "fail")
+        return self._counts["fail"]
     
     def add_check(self, name: str, status: str, message: str) -> None:
         """Add a validation check result."""
         self.items.append(ValidationItem(name=name, status=status, message=message))
+        self._counts[status] = self._counts.get(status, 0) + 1
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        return {
+        data = {
             "items": [
                 {"name": i.name, "status": i.status, "message": i.message}
                 for i in self.items
             ],
-            "quality_score": self.quality_score,
-            "quality_level": self.quality_level,
-            "pass_count": self.pass_count,
-            "warning_count": self.warning_count,
-            "fail_count": self.fail_count,
         }
+        data.update((k, getattr(self, k)) for k in self._DICT_FIELDS)
+        return data
 
 
-@dataclass
+@dataclass(slots=True)
 class Paper:
     """
     Complete research paper representation.
@@ -352,6 +455,9 @@ class Paper:
     file_size_bytes: int = 0
     status: ProcessingStatus = ProcessingStatus.UPLOADED
     file_path: str = ""
+    content_sha256: Optional[str] = None  # Hex digest of the uploaded file
+    images_extracted: bool = True  # Whether image extraction was requested
+    tables_extracted: bool = True  # Whether table extraction was requested
     
     # Extracted content
     sections: List[Section] = field(default_factory=list)
@@ -364,6 +470,24 @@ class Paper:
     # Validation
     validation_report: Optional[ValidationReport] = None
     
+    # First section per type, built by get_section; cleared by invalidate_section_index
+    _section_index: Optional[Dict[SectionType, Section]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    # Includes the derived count/score properties, which getattr resolves too
+    _DICT_FIELDS = (
+        "id", "filename", "title", "upload_date", "page_count", "file_size_bytes",
+        "status", "file_path", "content_sha256", "images_extracted",
+        "tables_extracted", "section_count", "image_count", "table_count",
+        "quality_score",
+    )
+    _FROM_DICT_DEFAULTS = {
+        "id": None, "filename": "", "title": "", "upload_date": None, "page_count": 0,
+        "file_size_bytes": 0, "status": "uploaded", "file_path": "", "content_sha256": None,
+        "images_extracted": True, "tables_extracted": True,
+    }
+    
     def __post_init__(self):
         """Set upload date if not provided."""
         if self.upload_date is None:
@@ -400,16 +524,25 @@ class Paper:
         """
         Get a specific section by type.
         
+        The type index is built on first use; call
+        ``invalidate_section_index`` after changing ``sections``.
+        
         Args:
             section_type: Type of section to find
             
         Returns:
-            Section if found, None otherwise
+            First section of that type if found, None otherwise
         """
-        for section in self.sections:
-            if section.section_type == section_type:
-                return section
-        return None
+        if self._section_index is None:
+            index: Dict[SectionType, Section] = {}
+            for section in self.sections:
+                index.setdefault(section.section_type, section)
+            self._section_index = index
+        return self._section_index.get(section_type)
+    
+    def invalidate_section_index(self) -> None:
+        """Drop the index used by get_section after sections change."""
+        self._section_index = None
     
     def get_sections_by_confidence(
         self,
@@ -428,38 +561,26 @@ class Paper:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for storage/serialization."""
-        return {
-            "id": self.id,
-            "filename": self.filename,
-            "title": self.title,
-            "upload_date": self.upload_date.isoformat() if self.upload_date else None,
-            "page_count": self.page_count,
-            "file_size_bytes": self.file_size_bytes,
-            "status": self.status.value,
-            "file_path": self.file_path,
-            "section_count": self.section_count,
-            "image_count": self.image_count,
-            "table_count": self.table_count,
-            "quality_score": self.quality_score,
-        }
+        data = {k: getattr(self, k) for k in self._DICT_FIELDS}
+        data["upload_date"] = self.upload_date.isoformat() if self.upload_date else None
+        data["status"] = self.status.value
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Paper":
         """Create Paper from dictionary (basic fields only)."""
-        upload_date = None
-        if data.get("upload_date"):
+        kwargs = {k: data.get(k, default) for k, default in cls._FROM_DICT_DEFAULTS.items()}
+        
+        # Only non-empty strings need parsing; datetimes pass through and
+        # anything else falls back to __post_init__'s default
+        upload_date = kwargs["upload_date"]
+        if isinstance(upload_date, str) and upload_date:
             try:
-                upload_date = datetime.fromisoformat(data["upload_date"])
-            except (ValueError, TypeError):
-                upload_date = datetime.now()
+                kwargs["upload_date"] = datetime.fromisoformat(upload_date)
+            except ValueError:
+                kwargs["upload_date"] = datetime.now()
+        elif not isinstance(upload_date, datetime):
+            kwargs["upload_date"] = None
+        kwargs["status"] = ProcessingStatus(kwargs["status"])
         
-        return cls(
-            id=data.get("id"),
-            filename=data.get("filename", ""),
-            title=data.get("title", ""),
-            upload_date=upload_date,
-            page_count=data.get("page_count", 0),
-            file_size_bytes=data.get("file_size_bytes", 0),
-            status=ProcessingStatus(data.get("status", "uploaded")),
-            file_path=data.get("file_path", ""),
-        )
+        return cls(**kwargs)
@@ -4,18 +4,29 @@ Image extraction from PDF files.
 Extracts embedded images and saves them with metadata.
 """
 
-import fitz  # PyMuPDF
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple
-from PIL import Image
-import io
+from typing import TYPE_CHECKING, Iterator, List, Optional, Set, Tuple
 
 from models import ExtractedImage
 from utils import Config, get_logger
 
+if TYPE_CHECKING:
+    import fitz  # PyMuPDF
+    from PIL import Image
+
 
 logger = get_logger("paperiq.images")
 
+# Started from a thread of the upload page's stage pool, so fork would copy
+# locks held by the other stages; start workers fresh as PDFExtractor does
+_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+# (1-indexed page number, image number, xref) of an image to extract
+ImageTarget = Tuple[int, int, int]
+
 
 class ImageHandler:
     """
@@ -29,9 +40,15 @@ class ImageHandler:
     MIN_WIDTH = 50
     MIN_HEIGHT = 50
     
-    # Supported output formats
+    # Format used when an image has to be re-encoded
     OUTPUT_FORMAT = "PNG"
     
+    # Embedded formats written to disk as-is (extension -> file suffix)
+    PASSTHROUGH_FORMATS = {"png": "png", "jpeg": "jpg", "jpg": "jpg"}
+    
+    # Colorspace component counts browsers render correctly (gray, RGB)
+    PASSTHROUGH_COLORSPACES = (1, 3)
+    
     def __init__(self, config: Optional[Config] = None):
         """
         Initialize image handler with configuration.
@@ -45,14 +62,24 @@ class ImageHandler:
     def extract_images(
         self,
         pdf_path: Path,
-        paper_id: int
+        paper_id: int,
+        num_workers: Optional[int] = None
     ) -> List[ExtractedImage]:
         """
         Extract all images from a PDF file.
         
+        A first pass lists the images each page references. Images are
+        numbered by their position in that list, and an image embedded on
+        several pages (same xref) is only extracted where it first
+        appears. Each unique image is then extracted once at document
+        level. Documents with at least ``config.parallel_min_images``
+        unique images use a process pool (PyMuPDF is not thread-safe);
+        below that, re-encoding costs less than starting the workers.
+        
         Args:
             pdf_path: Path to the PDF file
             paper_id: ID of the paper (for naming files)
+            num_workers: Worker processes (default: config.pdf_workers, capped at CPU count)
             
         Returns:
             List of ExtractedImage objects
@@ -61,21 +88,39 @@ class ImageHandler:
             logger.error(f"PDF file not found: {pdf_path}")
             return []
         
+        import fitz  # PyMuPDF
+        
         doc = None
         extracted_images: List[ExtractedImage] = []
-        image_counter = 0
         
         try:
             doc = fitz.open(pdf_path)
             
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                page_images = self._extract_page_images(
-                    page, page_num + 1, paper_id, image_counter
-                )
+            if num_workers is None:
+                num_workers = min(os.cpu_count() or 1, self.config.pdf_workers)
+            
+            targets = self._collect_image_targets(doc)
+            
+            if num_workers > 1 and len(targets) >= self.config.parallel_min_images:
+                # One contiguous run of images per worker, split by count so
+                # pages dense with figures don't land on a single worker
+                per_task = -(-len(targets) // num_workers)
+                blocks = [targets[i:i + per_task] for i in range(0, len(targets), per_task)]
                 
-                image_counter += len(page_images)
-                extracted_images.extend(page_images)
+                with ProcessPoolExecutor(
+                    max_workers=len(blocks),
+                    mp_context=_MP_CONTEXT,
+                ) as executor:
+                    chunks = executor.map(
+                        _extract_image_targets,
+                        [str(pdf_path)] * len(blocks),
+                        [paper_id] * len(blocks),
+                        blocks,
+                    )
+                    for chunk in chunks:
+                        extracted_images.extend(chunk)
+            else:
+                extracted_images.extend(self._extract_targets(doc, paper_id, targets))
             
             logger.info(f"Extracted {len(extracted_images)} images from PDF")
             return extracted_images
@@ -87,34 +132,51 @@ class ImageHandler:
             if doc is not None:
                 doc.close()
     
-    def _extract_page_images(
+    def _collect_image_targets(self, doc: "fitz.Document") -> List[ImageTarget]:
+        """
+        List the first occurrence of every embedded image in a document.
+        
+        Args:
+            doc: Open PyMuPDF document
+            
+        Returns:
+            (1-indexed page number, image number, xref) tuples in page order
+        """
+        targets: List[ImageTarget] = []
+        seen: Set[int] = set()
+        image_num = 0
+        
+        for page_num in range(len(doc)):
+            for img_info in doc[page_num].get_images(full=False):
+                image_num += 1
+                xref = img_info[0]  # Image reference number
+                if xref not in seen:
+                    seen.add(xref)
+                    targets.append((page_num + 1, image_num, xref))
+        
+        return targets
+    
+    def _extract_targets(
         self,
-        page: fitz.Page,
-        page_number: int,
+        doc: "fitz.Document",
         paper_id: int,
-        start_index: int
-    ) -> List[ExtractedImage]:
+        targets: List[ImageTarget]
+    ) -> Iterator[ExtractedImage]:
         """
-        Extract images from a single page.
+        Extract and save the listed images, yielding each one once saved.
         
         Args:
-            page: PyMuPDF page object
-            page_number: 1-indexed page number
+            doc: Open PyMuPDF document
             paper_id: Paper ID for file naming
-            start_index: Starting index for image numbering
+            targets: (page number, image number, xref) tuples to extract
             
-        Returns:
-            List of ExtractedImage objects
+        Yields:
+            ExtractedImage objects for the images that were kept
         """
-        images: List[ExtractedImage] = []
-        image_list = page.get_images(full=True)
-        
-        for img_index, img_info in enumerate(image_list):
+        for page_number, image_num, xref in targets:
             try:
-                xref = img_info[0]  # Image reference number
-                
                 # Extract image data
-                base_image = page.parent.extract_image(xref)
+                base_image = doc.extract_image(xref)
                 if not base_image:
                     continue
                 
@@ -130,53 +192,67 @@ class ImageHandler:
                 if width < self.MIN_WIDTH or height < self.MIN_HEIGHT:
                     continue
                 
-                # Convert and save image
-                image_num = start_index + img_index + 1
-                saved_path = self._save_image(
-                    image_bytes, paper_id, image_num, width, height
+                # Save image, keeping the embedded stream when possible
+                saved_path, image_format = self._save_image(
+                    base_image, paper_id, image_num, width, height
                 )
                 
                 if saved_path:
-                    images.append(ExtractedImage(
+                    yield ExtractedImage(
                         paper_id=paper_id,
                         file_path=str(saved_path),
                         page_number=page_number,
                         width=width,
                         height=height,
-                        format=self.OUTPUT_FORMAT,
-                    ))
+                        format=image_format,
+                    )
                     
             except Exception as e:
-                logger.warning(f"Failed to extract image {img_index} on page {page_number}: {e}")
+                logger.warning(f"Failed to extract image {image_num} on page {page_number}: {e}")
                 continue
-        
-        return images
     
     def _save_image(
         self,
-        image_bytes: bytes,
+        base_image: dict,
         paper_id: int,
         image_num: int,
         width: int,
         height: int
-    ) -> Optional[Path]:
+    ) -> Tuple[Optional[Path], str]:
         """
-        Save image bytes to file.
+        Save an extracted image to file.
         
-        Converts image to PNG format for consistency.
+        PNG and JPEG streams in gray or RGB are written unchanged, which
+        skips a decode/encode round trip. Anything else (CMYK, JPX, JBIG2,
+        ...) is converted to PNG with PIL.
         
         Args:
-            image_bytes: Raw image data
+            base_image: Result of ``fitz.Document.extract_image``
             paper_id: Paper ID for file naming
             image_num: Image number for file naming
             width: Image width
             height: Image height
             
         Returns:
-            Path to saved file, or None on failure
+            Tuple of (path to saved file or None on failure, format name)
         """
+        image_bytes = base_image["image"]
+        ext = base_image.get("ext", "").lower()
+        suffix = self.PASSTHROUGH_FORMATS.get(ext)
+        
         try:
+            if suffix and base_image.get("colorspace") in self.PASSTHROUGH_COLORSPACES:
+                filename = f"paper_{paper_id}_img_{image_num}.{suffix}"
+                save_path = self.images_dir / filename
+                save_path.write_bytes(image_bytes)
+                
+                logger.debug(f"Saved image: {filename} ({width}x{height})")
+                return save_path, "JPEG" if suffix == "jpg" else "PNG"
+            
             # Open with PIL to handle format conversion
+            import io
+            from PIL import Image
+            
             image = Image.open(io.BytesIO(image_bytes))
             
             # Convert to RGB if necessary (handles CMYK, palette, etc.)
@@ -192,21 +268,25 @@ class ImageHandler:
             filename = f"paper_{paper_id}_img_{image_num}.png"
             save_path = self.images_dir / filename
             
-            # Save as PNG
-            image.save(save_path, format="PNG", optimize=True)
+            # Save as PNG; extracted images are working files, so favour speed
+            image.save(
+                save_path,
+                format="PNG",
+                compress_level=self.config.png_compress_level,
+            )
             
             logger.debug(f"Saved image: {filename} ({width}x{height})")
-            return save_path
+            return save_path, self.OUTPUT_FORMAT
             
         except Exception as e:
             logger.warning(f"Failed to save image: {e}")
-            return None
+            return None, self.OUTPUT_FORMAT
     
     def get_image_thumbnail(
         self,
         image_path: Path,
         max_size: Tuple[int, int] = (200, 200)
-    ) -> Optional[Image.Image]:
+    ) -> Optional["Image.Image"]:
         """
         Generate a thumbnail of an extracted image.
         
@@ -221,6 +301,8 @@ class ImageHandler:
             if not image_path.exists():
                 return None
             
+            from PIL import Image
+            
             image = Image.open(image_path)
             image.thumbnail(max_size, Image.Resampling.LANCZOS)
             return image
@@ -240,13 +322,40 @@ class ImageHandler:
             Number of files deleted
         """
         deleted = 0
-        pattern = f"paper_{paper_id}_img_*.png"
+        # Images may be .png or .jpg, so match on the prefix only
+        prefix = f"paper_{paper_id}_img_"
         
-        for image_file in self.images_dir.glob(pattern):
-            try:
-                image_file.unlink()
-                deleted += 1
-            except Exception as e:
-                logger.warning(f"Failed to delete {image_file}: {e}")
+        with os.scandir(self.images_dir) as entries:
+            for entry in entries:
+                if not entry.name.startswith(prefix):
+                    continue
+                try:
+                    os.unlink(entry.path)
+                    deleted += 1
+                except Exception as e:
+                    logger.warning(f"Failed to delete {entry.path}: {e}")
         
         return deleted
+
+
+def _extract_image_targets(
+    pdf_path: str,
+    paper_id: int,
+    targets: List[ImageTarget]
+) -> List[ExtractedImage]:
+    """
+    Extract the listed images in a worker process.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        paper_id: Paper ID for file naming
+        targets: (page number, image number, xref) tuples to extract
+        
+    Returns:
+        ExtractedImage objects in target order
+    """
+    import fitz  # PyMuPDF
+    
+    handler = ImageHandler()
+    with fitz.open(pdf_path) as doc:
+        return list(handler._extract_targets(doc, paper_id, targets))
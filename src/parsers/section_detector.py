@@ -6,10 +6,13 @@ pattern matching and layout analysis with confidence scoring.
 """
 
 import re
-from typing import List, Dict, Optional, Tuple
+from bisect import bisect_left
+from typing import List, Dict, Optional, Tuple, Union
 from dataclasses import dataclass
 
-from models import Section, SectionType, TextBlock
+import numpy as np
+
+from models import Section, SectionType, TextBlock, TextBlockArray
 from utils import Config, get_logger
 from parsers.text_cleaner import TextCleaner
 
@@ -17,7 +20,7 @@ from parsers.text_cleaner import TextCleaner
 logger = get_logger("paperiq.sections")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SectionMatch:
     """Represents a potential section header match."""
     section_type: SectionType
@@ -94,9 +97,33 @@ class SectionDetector:
         ],
     }
     
+    # Keywords for lenient matching of layout headers; earlier entries win
+    # when a header contains several
+    LAYOUT_KEYWORDS: Dict[str, SectionType] = {
+        "abstract": SectionType.ABSTRACT,
+        "introduction": SectionType.INTRODUCTION,
+        "methodology": SectionType.METHODOLOGY,
+        "methods": SectionType.METHODOLOGY,
+        "materials and methods": SectionType.METHODOLOGY,
+        "experimental setup": SectionType.METHODOLOGY,
+        "results": SectionType.RESULTS,
+        "experiments": SectionType.RESULTS,
+        "experimental results": SectionType.RESULTS,
+        "discussion": SectionType.DISCUSSION,
+        "analysis": SectionType.DISCUSSION,
+        "conclusion": SectionType.CONCLUSION,
+        "conclusions": SectionType.CONCLUSION,
+        "concluding remarks": SectionType.CONCLUSION,
+        "references": SectionType.REFERENCES,
+        "bibliography": SectionType.REFERENCES,
+    }
+    
     # Minimum font size ratio to consider as header
     HEADER_FONT_RATIO = 1.2
     
+    # Lines longer than this are never tested against the header patterns
+    MAX_HEADER_LENGTH = 64
+    
     def __init__(self, config: Optional[Config] = None):
         """
         Initialize section detector with configuration.
@@ -107,25 +134,45 @@ class SectionDetector:
         self.config = config or Config()
         self.text_cleaner = TextCleaner(remove_citations=True)
         
-        # Compile regex patterns
-        self._compiled_patterns: Dict[SectionType, List[re.Pattern]] = {}
-        for section_type, patterns in self.SECTION_PATTERNS.items():
-            self._compiled_patterns[section_type] = [
-                re.compile(p, re.IGNORECASE | re.MULTILINE)
-                for p in patterns
-            ]
+        # Compile all header patterns into one alternation, one named group
+        # per section type; the ^...$ anchors are replaced by fullmatch
+        self._header_pattern = re.compile(
+            "|".join(
+                f"(?P<{section_type.name}>"
+                + "|".join(p.removeprefix("^").removesuffix("$") for p in patterns)
+                + ")"
+                for section_type, patterns in self.SECTION_PATTERNS.items()
+            ),
+            re.IGNORECASE,
+        )
+        self._group_to_type: Dict[str, SectionType] = {
+            section_type.name: section_type for section_type in self.SECTION_PATTERNS
+        }
+        
+        # All layout keywords in one alternation, longest first so a phrase
+        # wins over a keyword it contains
+        self._keyword_pattern = re.compile(
+            "|".join(map(re.escape, sorted(self.LAYOUT_KEYWORDS, key=len, reverse=True))),
+            re.IGNORECASE,
+        )
+        self._keyword_rank: Dict[str, Tuple[int, SectionType]] = {
+            keyword: (rank, section_type)
+            for rank, (keyword, section_type) in enumerate(self.LAYOUT_KEYWORDS.items())
+        }
     
     def detect_sections(
         self,
         full_text: str,
-        text_blocks: Optional[List[TextBlock]] = None
+        text_blocks: Optional[Union[TextBlockArray, List[TextBlock]]] = None,
+        paper_id: Optional[int] = None
     ) -> List[Section]:
         """
         Detect and extract all sections from paper text.
         
         Args:
             full_text: Complete extracted text
-            text_blocks: Optional list of TextBlocks with layout info
+            text_blocks: Optional TextBlocks (or TextBlockArray) with layout info
+            paper_id: Paper ID to assign to the created sections
             
         Returns:
             List of detected Section objects
@@ -144,7 +191,7 @@ class SectionDetector:
         matches.sort(key=lambda m: m.position)
         
         # Extract section content
-        sections = self._extract_section_content(full_text, matches)
+        sections = self._extract_section_content(full_text, matches, paper_id)
         
         # Log results
         for section in sections:
@@ -158,7 +205,7 @@ class SectionDetector:
     def _find_section_headers(
         self,
         text: str,
-        text_blocks: Optional[List[TextBlock]] = None
+        text_blocks: Optional[Union[TextBlockArray, List[TextBlock]]] = None
     ) -> List[SectionMatch]:
         """
         Find all potential section headers in text.
@@ -201,37 +248,42 @@ class SectionDetector:
             List of SectionMatch objects
         """
         matches: List[SectionMatch] = []
-        lines = text.split("\n")
+        max_length = self.MAX_HEADER_LENGTH
         
         char_position = 0
-        for line in lines:
+        for line in text.splitlines(keepends=True):
+            line_start = char_position
+            char_position += len(line)
+            
             line_stripped = line.strip()
             
-            if not line_stripped:
-                char_position += len(line) + 1
+            # Every header pattern starts with a letter or digit and ends
+            # with a letter, so body text is ruled out before the regex
+            if (
+                not line_stripped
+                or len(line_stripped) > max_length
+                or not line_stripped[0].isalnum()
+                or not line_stripped[-1].isalpha()
+            ):
                 continue
             
-            # Check against all patterns
-            for section_type, patterns in self._compiled_patterns.items():
-                for pattern in patterns:
-                    if pattern.match(line_stripped):
-                        matches.append(SectionMatch(
-                            section_type=section_type,
-                            header_text=line_stripped,
-                            position=char_position,
-                            confidence=0.7,  # Base pattern match confidence
-                            method="pattern",
-                        ))
-                        break
-            
-            char_position += len(line) + 1
+            # Check against all patterns at once
+            match = self._header_pattern.fullmatch(line_stripped)
+            if match:
+                matches.append(SectionMatch(
+                    section_type=self._group_to_type[match.lastgroup],
+                    header_text=line_stripped,
+                    position=line_start,
+                    confidence=0.7,  # Base pattern match confidence
+                    method="pattern",
+                ))
         
         return matches
     
     def _layout_analysis(
         self,
         text: str,
-        text_blocks: List[TextBlock]
+        text_blocks: Union[TextBlockArray, List[TextBlock]]
     ) -> List[SectionMatch]:
         """
         Find potential headers using layout analysis.
@@ -250,40 +302,64 @@ class SectionDetector:
         if not text_blocks:
             return matches
         
+        if isinstance(text_blocks, TextBlockArray):
+            blocks = text_blocks
+        else:
+            blocks = TextBlockArray.from_blocks(text_blocks)
+        
         # Calculate average font size
-        font_sizes = [b.font_size for b in text_blocks if b.font_size > 0]
-        if not font_sizes:
+        font_sizes = blocks.font_size[blocks.font_size > 0]
+        if not font_sizes.size:
             return matches
         
-        avg_font_size = sum(font_sizes) / len(font_sizes)
+        avg_font_size = float(font_sizes.mean(dtype=np.float64))
         header_threshold = avg_font_size * self.HEADER_FONT_RATIO
         
+        # Only large or bold blocks can be headers; compare at the column's
+        # float32 precision so sizes equal to the threshold still count
+        is_large = blocks.font_size >= np.float32(header_threshold)
+        candidates = np.flatnonzero(is_large | blocks.is_bold)
+        
+        # Blocks are in reading order, so positions are searched forward
+        # from the previous header; the same span text repeats a lot
+        text_lower = text.lower()
+        search_start = 0
+        section_types: Dict[str, Optional[SectionType]] = {}
+        
         # Find blocks that look like headers
-        for block in text_blocks:
-            block_text = block.text.strip()
+        for index in candidates:
+            block_text = blocks.text[index].strip()
             
             # Skip long text (headers are usually short)
             if len(block_text) > 100:
                 continue
             
-            # Skip if not potentially a header based on layout
-            is_large_font = block.font_size >= header_threshold
-            if not (is_large_font or block.is_bold):
-                continue
+            is_large_font = bool(is_large[index])
+            is_bold = bool(blocks.is_bold[index])
             
             # Try to match to a section type
-            section_type = self._match_text_to_section(block_text)
+            needle = block_text.lower()
+            if needle in section_types:
+                section_type = section_types[needle]
+            else:
+                section_type = section_types[needle] = self._match_text_to_section(block_text)
+            
             if section_type:
-                # Find position in text
-                position = text.lower().find(block_text.lower())
+                # Find position in text, falling back to a full search if the
+                # block is out of order
+                position = text_lower.find(needle, search_start)
                 if position == -1:
-                    continue
+                    position = text_lower.find(needle)
+                    if position == -1:
+                        continue
+                else:
+                    search_start = position + len(needle)
                 
                 # Calculate confidence based on layout features
                 confidence = 0.5  # Base layout confidence
                 if is_large_font:
                     confidence += 0.2
-                if block.is_bold:
+                if is_bold:
                     confidence += 0.15
                 
                 matches.append(SectionMatch(
@@ -292,8 +368,8 @@ class SectionDetector:
                     position=position,
                     confidence=confidence,
                     method="layout",
-                    font_size=block.font_size,
-                    is_bold=block.is_bold,
+                    font_size=float(blocks.font_size[index]),
+                    is_bold=is_bold,
                 ))
         
         return matches
@@ -310,33 +386,16 @@ class SectionDetector:
         Returns:
             SectionType or None
         """
-        text_lower = text.lower().strip()
-        
-        # Simple keyword matching
-        keyword_map = {
-            "abstract": SectionType.ABSTRACT,
-            "introduction": SectionType.INTRODUCTION,
-            "methodology": SectionType.METHODOLOGY,
-            "methods": SectionType.METHODOLOGY,
-            "materials and methods": SectionType.METHODOLOGY,
-            "experimental setup": SectionType.METHODOLOGY,
-            "results": SectionType.RESULTS,
-            "experiments": SectionType.RESULTS,
-            "experimental results": SectionType.RESULTS,
-            "discussion": SectionType.DISCUSSION,
-            "analysis": SectionType.DISCUSSION,
-            "conclusion": SectionType.CONCLUSION,
-            "conclusions": SectionType.CONCLUSION,
-            "concluding remarks": SectionType.CONCLUSION,
-            "references": SectionType.REFERENCES,
-            "bibliography": SectionType.REFERENCES,
-        }
-        
-        for keyword, section_type in keyword_map.items():
-            if keyword in text_lower:
-                return section_type
-        
-        return None
+        # One scan for all keywords; the earliest-listed keyword found wins
+        found = [
+            self._keyword_rank[keyword]
+            for keyword in (m.group(0).lower() for m in self._keyword_pattern.finditer(text))
+            if keyword in self._keyword_rank
+        ]
+        if not found:
+            return None
+        
+        return min(found)[1]
     
     def _combine_matches(
         self,
@@ -358,17 +417,38 @@ class SectionDetector:
         combined: List[SectionMatch] = []
         used_layout = set()
         
+        # Layout matches per section type as (position, index), sorted, so
+        # the nearest one to a pattern match is found by binary search
+        by_type: Dict[SectionType, List[Tuple[int, int]]] = {}
+        for i, lm in enumerate(layout_matches):
+            by_type.setdefault(lm.section_type, []).append((lm.position, i))
+        positions_by_type: Dict[SectionType, List[int]] = {}
+        for section_type, entries in by_type.items():
+            entries.sort()
+            positions_by_type[section_type] = [position for position, _ in entries]
+        
         for pm in pattern_matches:
             # Look for corresponding layout match
             best_layout = None
-            best_distance = float("inf")
             
-            for i, lm in enumerate(layout_matches):
-                if lm.section_type == pm.section_type:
-                    distance = abs(pm.position - lm.position)
-                    if distance < best_distance and distance < 500:  # Within 500 chars
-                        best_distance = distance
-                        best_layout = (i, lm)
+            entries = by_type.get(pm.section_type)
+            if entries:
+                positions = positions_by_type[pm.section_type]
+                right = bisect_left(positions, pm.position)
+                neighbours = []
+                if right > 0:
+                    # First entry at the nearest smaller position (lowest index)
+                    left = bisect_left(positions, positions[right - 1])
+                    neighbours.append(entries[left])
+                if right < len(entries):
+                    neighbours.append(entries[right])
+                
+                # Nearest wins, ties go to the earlier layout match
+                distance, i = min(
+                    (abs(pm.position - position), i) for position, i in neighbours
+                )
+                if distance < 500:  # Within 500 chars
+                    best_layout = (i, layout_matches[i])
             
             if best_layout is not None:
                 # Combined match - boost confidence
@@ -423,7 +503,8 @@ class SectionDetector:
     def _extract_section_content(
         self,
         text: str,
-        matches: List[SectionMatch]
+        matches: List[SectionMatch],
+        paper_id: Optional[int] = None
     ) -> List[Section]:
         """
         Extract the content for each detected section.
@@ -433,6 +514,7 @@ class SectionDetector:
         Args:
             text: Full text
             matches: Detected section headers
+            paper_id: Paper ID to assign to the created sections
             
         Returns:
             List of Section objects with content
@@ -466,6 +548,7 @@ class SectionDetector:
                 continue
             
             sections.append(Section(
+                paper_id=paper_id,
                 section_type=match.section_type,
                 content=content,
                 confidence=match.confidence,
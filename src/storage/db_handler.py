@@ -6,6 +6,7 @@ Auto-creates tables on first run.
 """
 
 import sqlite3
+import threading
 from pathlib import Path
 from typing import List, Optional, Tuple
 from datetime import datetime
@@ -39,27 +40,45 @@ class DatabaseHandler:
         self.config = config or Config()
         self.db_path = self.config.db_path
         
+        # Connection of the transaction open on the current thread, if any
+        self._local = threading.local()
+        
         # Ensure database directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Initialize database schema
         self._init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection with the handler's settings."""
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        # Safe under WAL: a crash can lose the last commit but not corrupt the DB
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+    
     @contextmanager
     def _get_connection(self):
         """
         Context manager for database connections.
         
-        Ensures connections are properly closed and commits are handled.
+        Inside a ``transaction()`` block the transaction's connection is
+        reused and committing is left to the transaction. Otherwise a new
+        connection is opened, committed on success and closed.
         
         Yields:
             sqlite3.Connection
         """
+        shared = getattr(self._local, "conn", None)
+        if shared is not None:
+            yield shared
+            return
+        
         conn = None
         try:
-            conn = sqlite3.connect(str(self.db_path), timeout=30.0)
-            conn.row_factory = sqlite3.Row
+            conn = self._connect()
             yield conn
+            conn.commit()
         except sqlite3.Error as e:
             logger.error(f"Database error: {e}")
             if conn:
@@ -69,11 +88,46 @@ class DatabaseHandler:
             if conn:
                 conn.close()
     
+    @contextmanager
+    def transaction(self):
+        """
+        Group several operations into a single commit.
+        
+        All handler calls made on this thread inside the block share one
+        connection and are committed together, or rolled back together if
+        the block raises. Nested blocks join the outer transaction.
+        
+        Example:
+            with db.transaction():
+                db.insert_sections(sections)
+                db.update_paper(paper)
+        """
+        if getattr(self._local, "conn", None) is not None:
+            yield
+            return
+        
+        conn = self._connect()
+        self._local.conn = conn
+        try:
+            yield
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Transaction rolled back: {e}")
+            conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            conn.close()
+    
     def _init_database(self) -> None:
         """Create database tables if they don't exist."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
             
+            # WAL is persistent in the database file and lets readers run
+            # alongside the upload page's writes
+            cursor.execute("PRAGMA journal_mode=WAL")
+            
             # Papers table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS papers (
@@ -85,10 +139,23 @@ class DatabaseHandler:
                     file_size_bytes INTEGER DEFAULT 0,
                     status TEXT DEFAULT 'uploaded',
                     file_path TEXT,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    content_sha256 TEXT,
+                    images_extracted INTEGER DEFAULT 1,
+                    tables_extracted INTEGER DEFAULT 1
                 )
             """)
             
+            # Migrate databases created before content hashing and extraction
+            # options; older papers always had images and tables extracted
+            cursor.execute("PRAGMA table_info(papers)")
+            columns = {row["name"] for row in cursor.fetchall()}
+            if "content_sha256" not in columns:
+                cursor.execute("ALTER TABLE papers ADD COLUMN content_sha256 TEXT")
+            for column in ("images_extracted", "tables_extracted"):
+                if column not in columns:
+                    cursor.execute(f"ALTER TABLE papers ADD COLUMN {column} INTEGER DEFAULT 1")
+            
             # Sections table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS sections (
@@ -145,8 +212,11 @@ class DatabaseHandler:
                 CREATE INDEX IF NOT EXISTS idx_tables_paper 
                 ON tables (paper_id)
             """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_papers_sha256 
+                ON papers (content_sha256)
+            """)
             
-            conn.commit()
             logger.debug("Database schema initialized")
     
     # ==================== Paper Operations ====================
@@ -166,8 +236,10 @@ class DatabaseHandler:
             
             cursor.execute("""
                 INSERT INTO papers (filename, title, upload_date, page_count, 
-                                    file_size_bytes, status, file_path)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                                    file_size_bytes, status, file_path,
+                                    content_sha256, images_extracted,
+                                    tables_extracted)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 paper.filename,
                 paper.title,
@@ -176,9 +248,11 @@ class DatabaseHandler:
                 paper.file_size_bytes,
                 paper.status.value,
                 paper.file_path,
+                paper.content_sha256,
+                int(paper.images_extracted),
+                int(paper.tables_extracted),
             ))
             
-            conn.commit()
             paper_id = cursor.lastrowid
             
             logger.info(f"Inserted paper: {paper.filename} (ID: {paper_id})")
@@ -202,17 +276,18 @@ class DatabaseHandler:
             
             cursor.execute("""
                 UPDATE papers 
-                SET title = ?, page_count = ?, file_size_bytes = ?, status = ?
+                SET title = ?, page_count = ?, file_size_bytes = ?, status = ?,
+                    file_path = ?
                 WHERE id = ?
             """, (
                 paper.title,
                 paper.page_count,
                 paper.file_size_bytes,
                 paper.status.value,
+                paper.file_path,
                 paper.id,
             ))
             
-            conn.commit()
             return cursor.rowcount > 0
     
     def update_paper_status(self, paper_id: int, status: ProcessingStatus) -> bool:
@@ -233,7 +308,6 @@ class DatabaseHandler:
                 UPDATE papers SET status = ? WHERE id = ?
             """, (status.value, paper_id))
             
-            conn.commit()
             return cursor.rowcount > 0
     
     def get_paper(self, paper_id: int, include_content: bool = True) -> Optional[Paper]:
@@ -265,6 +339,40 @@ class DatabaseHandler:
             
             return paper
     
+    def find_paper_by_sha256(
+        self,
+        content_sha256: str,
+        images: bool = True,
+        tables: bool = True
+    ) -> Optional[int]:
+        """
+        Find a completed paper with the given file content hash.
+        
+        Papers processed without an option that is now requested do not
+        match, so re-uploading with images or tables enabled re-processes.
+        
+        Args:
+            content_sha256: Hex SHA-256 digest of the PDF file
+            images: Whether the paper must have had images extracted
+            tables: Whether the paper must have had tables extracted
+            
+        Returns:
+            ID of the most recent matching paper, or None
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT id FROM papers 
+                WHERE content_sha256 = ? AND status = ?
+                  AND images_extracted >= ? AND tables_extracted >= ?
+                ORDER BY id DESC 
+                LIMIT 1
+            """, (content_sha256, ProcessingStatus.COMPLETED.value, int(images), int(tables)))
+            
+            row = cursor.fetchone()
+            return row["id"] if row else None
+    
     def get_all_papers(self, limit: int = 100) -> List[Paper]:
         """
         Get all papers (metadata only).
@@ -286,6 +394,38 @@ class DatabaseHandler:
             
             return [self._row_to_paper(row) for row in cursor.fetchall()]
     
+    def get_paper_summaries(self, limit: int = 100) -> List[Paper]:
+        """
+        Get papers with only the fields needed to list them.
+        
+        Selects id, filename, title and status; all other Paper fields keep
+        their defaults.
+        
+        Args:
+            limit: Maximum number of papers to return
+            
+        Returns:
+            List of Paper objects, newest first
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT id, filename, title, status FROM papers 
+                ORDER BY upload_date DESC 
+                LIMIT ?
+            """, (limit,))
+            
+            return [
+                Paper(
+                    id=row["id"],
+                    filename=row["filename"],
+                    title=row["title"] or "",
+                    status=ProcessingStatus(row["status"]),
+                )
+                for row in cursor.fetchall()
+            ]
+    
     def get_recent_papers(self, count: int = 5) -> List[Paper]:
         """
         Get most recently uploaded papers.
@@ -317,8 +457,6 @@ class DatabaseHandler:
             cursor.execute("DELETE FROM tables WHERE paper_id = ?", (paper_id,))
             cursor.execute("DELETE FROM papers WHERE id = ?", (paper_id,))
             
-            conn.commit()
-            
             if cursor.rowcount > 0:
                 logger.info(f"Deleted paper ID: {paper_id}")
                 return True
@@ -342,6 +480,9 @@ class DatabaseHandler:
             file_size_bytes=row["file_size_bytes"],
             status=ProcessingStatus(row["status"]),
             file_path=row["file_path"] or "",
+            content_sha256=row["content_sha256"],
+            images_extracted=bool(row["images_extracted"]),
+            tables_extracted=bool(row["tables_extracted"]),
         )
     
     # ==================== Section Operations ====================
@@ -373,7 +514,6 @@ class DatabaseHandler:
                 section.word_count,
             ))
             
-            conn.commit()
             return cursor.lastrowid
     
     def insert_sections(self, sections: List[Section]) -> List[int]:
@@ -386,7 +526,8 @@ class DatabaseHandler:
         Returns:
             List of inserted IDs
         """
-        return [self.insert_section(s) for s in sections]
+        with self.transaction():
+            return [self.insert_section(s) for s in sections]
     
     def get_sections(self, paper_id: int) -> List[Section]:
         """
@@ -449,7 +590,6 @@ class DatabaseHandler:
                 image.format,
             ))
             
-            conn.commit()
             return cursor.lastrowid
     
     def insert_images(self, images: List[ExtractedImage]) -> List[int]:
@@ -462,7 +602,8 @@ class DatabaseHandler:
         Returns:
             List of inserted IDs
         """
-        return [self.insert_image(img) for img in images]
+        with self.transaction():
+            return [self.insert_image(img) for img in images]
     
     def get_images(self, paper_id: int) -> List[ExtractedImage]:
         """
@@ -524,7 +665,6 @@ class DatabaseHandler:
                 table.preview,
             ))
             
-            conn.commit()
             return cursor.lastrowid
     
     def insert_tables(self, tables: List[ExtractedTable]) -> List[int]:
@@ -537,7 +677,8 @@ class DatabaseHandler:
         Returns:
             List of inserted IDs
         """
-        return [self.insert_table(t) for t in tables]
+        with self.transaction():
+            return [self.insert_table(t) for t in tables]
     
     def get_tables(self, paper_id: int) -> List[ExtractedTable]:
         """
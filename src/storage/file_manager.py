@@ -10,6 +10,7 @@ from pathlib import Path
 from typing import Optional, Tuple, BinaryIO
 from datetime import datetime
 import hashlib
+import uuid
 
 from utils import Config, get_logger
 
@@ -28,6 +29,9 @@ class FileManager:
     - Storage statistics
     """
     
+    # Filename prefix for uploads saved before a paper ID is assigned
+    STAGING_PREFIX = "staging_"
+    
     def __init__(self, config: Optional[Config] = None):
         """
         Initialize file manager.
@@ -55,15 +59,24 @@ class FileManager:
         self,
         file_data: BinaryIO,
         original_filename: str,
-        paper_id: int
+        paper_id: Optional[int] = None,
+        chunk_size: int = 1 << 20,
+        hasher: Optional["hashlib._Hash"] = None
     ) -> Tuple[Path, int]:
         """
         Save an uploaded PDF file.
         
+        The upload is copied to disk in ``chunk_size`` blocks rather than
+        read into a second in-memory buffer first. Without a ``paper_id``
+        the file is written under a staging name so it can be validated
+        before a database record exists; see ``promote_staged_file``.
+        
         Args:
             file_data: File-like object with PDF data
             original_filename: Original filename from upload
-            paper_id: ID of the paper in database
+            paper_id: ID of the paper in database (None to stage the file)
+            chunk_size: Copy buffer size in bytes (default 1 MiB)
+            hasher: Optional hashlib object updated with each chunk as it is written
             
         Returns:
             Tuple of (saved_path, file_size_bytes)
@@ -71,22 +84,45 @@ class FileManager:
         # Sanitize filename
         safe_name = self._sanitize_filename(original_filename)
         
-        # Create unique filename with paper ID
-        filename = f"paper_{paper_id}_{safe_name}"
+        # Create unique filename with paper ID, or a staging name
+        if paper_id is None:
+            filename = f"{self.STAGING_PREFIX}{uuid.uuid4().hex[:12]}_{safe_name}"
+        else:
+            filename = f"paper_{paper_id}_{safe_name}"
         save_path = self.config.upload_dir / filename
         
-        # Read file content
+        # Stream file content to disk
         file_data.seek(0)
-        content = file_data.read()
-        file_size = len(content)
-        
-        # Save file
         with open(save_path, "wb") as f:
-            f.write(content)
+            if hasher is None:
+                shutil.copyfileobj(file_data, f, length=chunk_size)
+            else:
+                while chunk := file_data.read(chunk_size):
+                    hasher.update(chunk)
+                    f.write(chunk)
+            file_size = f.tell()
         
         logger.info(f"Saved uploaded file: {filename} ({file_size} bytes)")
         return save_path, file_size
     
+    def promote_staged_file(self, staged_path: Path, paper_id: int) -> Path:
+        """
+        Rename a staged upload to its final per-paper filename.
+        
+        Args:
+            staged_path: Path returned by ``save_uploaded_file`` without a paper ID
+            paper_id: ID of the paper in database
+            
+        Returns:
+            Path of the renamed file
+        """
+        safe_name = staged_path.name[len(self.STAGING_PREFIX):].split("_", 1)[1]
+        final_path = staged_path.with_name(f"paper_{paper_id}_{safe_name}")
+        os.replace(staged_path, final_path)
+        
+        logger.debug(f"Promoted staged file: {staged_path.name} -> {final_path.name}")
+        return final_path
+    
     def save_file_from_path(
         self,
         source_path: Path,
@@ -197,7 +233,7 @@ class FileManager:
                 logger.warning(f"Failed to delete {pdf_file}: {e}")
         
         # Delete images
-        img_pattern = f"paper_{paper_id}_img_*.png"
+        img_pattern = f"paper_{paper_id}_img_*"
         for img_file in self.config.images_dir.glob(img_pattern):
             try:
                 img_file.unlink()
@@ -3,7 +3,7 @@ Utility modules for PaperIQ.
 """
 
 from utils.config import Config
-from utils.logger_config import setup_logger, get_logger
+from utils.logger_config import setup_logger, get_logger, log_stage
 from utils.validators import PDFValidator
 
-__all__ = ["Config", "setup_logger", "get_logger", "PDFValidator"]
+__all__ = ["Config", "setup_logger", "get_logger", "log_stage", "PDFValidator"]
@@ -57,6 +57,14 @@ class Config:
         self.enable_ocr: bool = os.getenv("ENABLE_OCR", "False").lower() == "true"
         self.min_section_length: int = int(os.getenv("MIN_SECTION_LENGTH", "50"))
         self.max_section_length: int = int(os.getenv("MAX_SECTION_LENGTH", "50000"))
+        self.parallel_extract: bool = (
+            os.getenv("PARALLEL_EXTRACT", "True").lower() == "true"
+        )
+        self.png_compress_level: int = int(os.getenv("PNG_COMPRESS_LEVEL", "1"))
+        self.pdf_workers: int = int(os.getenv("PDF_WORKERS", "4"))
+        self.pages_per_task: int = int(os.getenv("PAGES_PER_TASK", "4"))
+        self.parallel_min_pages: int = int(os.getenv("PARALLEL_MIN_PAGES", "2000"))
+        self.parallel_min_images: int = int(os.getenv("PARALLEL_MIN_IMAGES", "200"))
         
         # Confidence thresholds
         self.high_confidence_threshold: float = float(
@@ -6,8 +6,10 @@ Provides structured logging with console and optional file output.
 
 import logging
 import sys
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Iterator, Optional, Dict
 from datetime import datetime
 
 
@@ -119,6 +121,26 @@ def get_logger(name: str = "paperiq") -> logging.Logger:
     return setup_logger(name)
 
 
+@contextmanager
+def log_stage(name: str, logger: Optional[logging.Logger] = None) -> Iterator[None]:
+    """
+    Log the wall-clock duration of a pipeline stage.
+    
+    Emits ``stage=<name> ms=<elapsed>`` at INFO level when the block
+    exits, whether or not it raised.
+    
+    Args:
+        name: Stage name used in the log line
+        logger: Logger instance (uses default if not provided)
+    """
+    logger = logger or get_logger()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        logger.info("stage=%s ms=%.1f", name, (time.perf_counter() - start) * 1000)
+
+
 class ProcessingLogger:
     """
     Context manager for logging processing steps.